@@ -3,58 +3,320 @@ Smart Repository Assistant - GitHub Utilities
 Helper functions and utilities for GitHub API operations
 """
 
-from github import Github, GithubException
+from github import Auth, Github, GithubException
+from github.Requester import Requester
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from config import Config
+import requests
+import itertools
+import random
+import threading
 import time
 import logging
 
 logger = logging.getLogger(__name__)
 
-class GitHubUtils:
-    def __init__(self, token=None):
-        self.token = token or Config.GITHUB_TOKEN
-        self.github = Github(self.token)
+GRAPHQL_URL = "https://api.github.com/graphql"
+
+# Keep sockets alive across paginated sweeps and retry transient gateway errors
+HTTP_POOL_SIZE = 100
+
+def _http_retry():
+    return Retry(total=5, backoff_factor=0.5, status_forcelist=[502, 503, 504])
+
+def create_http_session():
+    """Create a requests session with a large keep-alive pool and retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=HTTP_POOL_SIZE, max_retries=_http_retry())
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# One pool for the whole process: every REST client, GraphQL client and token
+# exchange reuses the same warm TLS connections to api.github.com
+_SHARED_SESSION = create_http_session()
+
+def get_http_session():
+    """The process-wide pooled session shared by all GitHub clients"""
+    return _SHARED_SESSION
+
+class ConditionalResponseCache:
+    """Thread-safe LRU store of GitHub response bodies and their validators"""
+    
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+    
+    def set(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+class ConditionalRequester(Requester):
+    """Requester that revalidates cached GETs with If-None-Match/If-Modified-Since
+    
+    GitHub answers unchanged resources with 304 Not Modified, which does not
+    count against the rate limit; the cached body is replayed in that case.
+    """
+    response_cache = None
+    # When X-RateLimit-* headers were last seen, so callers can trust ``rate_limiting``
+    rate_limiting_updated_at = 0
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._thread_connections = threading.local()
+        self._connection_lock = threading.Lock()
+        # GETs answered 304 and replayed from cache vs. those that downloaded a body
+        self.conditional_stats = {'not_modified': 0, 'fetched': 0}
+        self._stats_lock = threading.Lock()
+    
+    def _Requester__createConnection(self):
+        # PyGithub's connection object stores each request between request() and
+        # getresponse(), so concurrent threads each get their own one, all sharing
+        # the process-wide pooled session so sockets are reused across clients too
+        connection = getattr(self._thread_connections, 'connection', None)
+        if connection is None:
+            with self._connection_lock:
+                self._Requester__connection = None
+                connection = super()._Requester__createConnection()
+                connection.session = get_http_session()
+            self._thread_connections.connection = connection
+        return connection
+    
+    def requestJson(self, verb, url, parameters=None, headers=None, input=None, cnx=None):
+        if verb != "GET" or self.response_cache is None:
+            return self._request_honoring_retry_after(verb, url, parameters, headers, input, cnx)
         
-    def get_rate_limit_info(self):
-        """Get current rate limit information"""
-        rate_limit = self.github.get_rate_limit()
-        return {
-            'core': {
-                'limit': rate_limit.core.limit,
-                'remaining': rate_limit.core.remaining,
-                'reset': rate_limit.core.reset
-            },
-            'search': {
-                'limit': rate_limit.search.limit,
-                'remaining': rate_limit.search.remaining,
-                'reset': rate_limit.search.reset
-            }
-        }
+        headers = dict(headers or {})
+        key = (url, urlencode(sorted((parameters or {}).items())), headers.get("Accept"))
+        cached = self.response_cache.get(key)
+        if cached:
+            if cached['etag']:
+                headers["If-None-Match"] = cached['etag']
+            elif cached['last_modified']:
+                headers["If-Modified-Since"] = cached['last_modified']
+        
+        status, response_headers, output = self._request_honoring_retry_after(
+            verb, url, parameters, headers, input, cnx
+        )
+        
+        with self._stats_lock:
+            self.conditional_stats['not_modified' if status == 304 and cached else 'fetched'] += 1
+        
+        if status == 304 and cached:
+            return cached['status'], {**cached['headers'], **response_headers}, cached['output']
+        
+        if status == 200 and ('etag' in response_headers or 'last-modified' in response_headers):
+            self.response_cache.set(key, {
+                'etag': response_headers.get('etag'),
+                'last_modified': response_headers.get('last-modified'),
+                'status': status,
+                'headers': response_headers,
+                'output': output
+            })
+        
+        return status, response_headers, output
     
-    def wait_for_rate_limit(self):
-        """Wait if rate limit is exceeded"""
-        rate_limit = self.github.get_rate_limit()
-        if rate_limit.core.remaining < 10:
-            reset_time = rate_limit.core.reset.timestamp()
-            sleep_time = max(reset_time - time.time(), 0) + 1
-            logger.info(f"Rate limit low, sleeping for {sleep_time:.1f} seconds")
+    def _request_honoring_retry_after(self, verb, url, parameters, headers, input, cnx):
+        """Send a request, retrying secondary rate limit responses after the delay GitHub asks for"""
+        for attempt in range(MAX_RATE_LIMIT_RETRIES + 1):
+            status, response_headers, output = super().requestJson(
+                verb, url, parameters, headers, input, cnx
+            )
+            self._note_rate_limit(response_headers)
+            
+            delay = _secondary_rate_limit_delay(status, response_headers, output, attempt)
+            if delay is None or attempt == MAX_RATE_LIMIT_RETRIES:
+                return status, response_headers, output
+            logger.warning(f"Secondary rate limit on {verb} {url}, retrying in {delay:.1f} seconds")
+            time.sleep(delay)
+    
+    def _note_rate_limit(self, response_headers):
+        if 'x-ratelimit-remaining' in response_headers:
+            self.rate_limiting_updated_at = time.time()
+
+MAX_RATE_LIMIT_RETRIES = 3
+
+def _backoff_delay(attempt, base=1, cap=60):
+    """Exponential backoff with jitter so concurrent workers don't retry in lockstep"""
+    return min(base * 2 ** attempt, cap) + random.random()
+
+def _secondary_rate_limit_delay(status, headers, output, attempt):
+    """Seconds to wait before retrying a rate-limited response, or None if it isn't one
+    
+    Primary limit exhaustion (remaining 0 without Retry-After) is left to
+    ``wait_for_rate_limit``; secondary limits honor Retry-After when given.
+    """
+    if status not in (403, 429):
+        return None
+    if 'retry-after' in headers:
+        try:
+            return float(headers['retry-after'])
+        except ValueError:
+            return _backoff_delay(attempt)
+    if 'secondary rate limit' in str(output).lower():
+        return _backoff_delay(attempt)
+    return None
+
+# One response cache per credential identity, since cached bodies depend on what it can see.
+# Rotating credentials (hourly installation tokens) pass a stable cache_key so they share one.
+_response_caches = {}
+_response_caches_lock = threading.Lock()
+
+def _get_response_cache(cache_key):
+    with _response_caches_lock:
+        if cache_key not in _response_caches:
+            _response_caches[cache_key] = ConditionalResponseCache()
+        return _response_caches[cache_key]
+
+def create_github_client(token=None, cache_key=None):
+    """Create a Github client whose GET requests are sent as conditional requests"""
+    # 100 is the largest page GitHub serves, minimizing pagination round-trips
+    github = Github(
+        auth=Auth.Token(token) if token else None,
+        per_page=100,
+        retry=_http_retry(),
+        pool_size=HTTP_POOL_SIZE
+    )
+    
+    requester = ConditionalRequester(**github._Github__requester.kwargs)
+    requester.response_cache = _get_response_cache(cache_key if cache_key is not None else token)
+    github._Github__requester = requester
+    return github
+
+class GitHubClientPool:
+    """Round-robin pool of GitHub clients, one per token, that skips drained tokens"""
+    
+    # Rate-limit headers older than this are refreshed from /rate_limit
+    RATE_LIMIT_MAX_AGE = 60
+    
+    def __init__(self, tokens=None, min_remaining=50):
+        self.clients = [create_github_client(token) for token in tokens or [None]]
+        self.min_remaining = min_remaining
+        self._cycle = itertools.cycle(self.clients)
+        self._lock = threading.Lock()
+    
+    def get_client(self):
+        """Return the next client with quota to spare, or simply the next one if all are low"""
+        with self._lock:
+            for _ in range(len(self.clients)):
+                client = next(self._cycle)
+                if client.rate_limiting[0] > self.min_remaining:
+                    return client
+            return next(self._cycle)
+    
+    def wait_for_rate_limit(self, threshold=10):
+        """Wait while every token is below ``threshold``, in growing jittered steps
+        
+        Sleeping in backoff steps capped at the earliest reset (rather than
+        straight to it) re-checks the budget periodically, and the jitter keeps
+        workers that drained together from waking together.
+        """
+        attempt = 0
+        while not any(self._remaining(client) >= threshold for client in self.clients):
+            reset_time = min(client._Github__requester.rate_limiting_resettime for client in self.clients)
+            sleep_time = min(max(reset_time - time.time(), 0), _backoff_delay(attempt)) + random.random()
+            logger.info(f"Rate limit low on all {len(self.clients)} token(s), sleeping for {sleep_time:.1f} seconds")
             time.sleep(sleep_time)
+            attempt += 1
     
-    def get_repository_safely(self, repo_name):
-        """Get repository with error handling"""
+    def _remaining(self, client):
+        """Remaining core requests from the last response headers, refreshed when stale
+        
+        Mirrors the server's budget locally: headers update it on every
+        response and it refills to the full limit once the reset time passes.
+        """
+        requester = client._Github__requester
+        remaining, limit = requester.rate_limiting
+        if requester.rate_limiting_resettime and time.time() >= requester.rate_limiting_resettime:
+            return max(remaining, limit)
+        
+        updated_at = getattr(requester, 'rate_limiting_updated_at', 0)
+        if time.time() - updated_at > self.RATE_LIMIT_MAX_AGE:
+            client.get_rate_limit()
+        return requester.rate_limiting[0]
+
+def resolve_tokens(token=None, tokens=None):
+    """Pick the tokens to use: an explicit list, an explicit token, or the configured pool"""
+    return list(tokens or ([token] if token else Config.GITHUB_TOKENS)) or [None]
+
+class GitHubGraphQL:
+    """Minimal client for the GitHub GraphQL API"""
+    
+    def __init__(self, token=None, session=None):
+        self.token = token or Config.GITHUB_TOKEN
+        self.session = session or get_http_session()
+        self.request_count = 0
+    
+    def execute(self, query, variables=None, allow_partial=False):
+        """Run a query or mutation and return its ``data`` payload
+        
+        With ``allow_partial`` a response carrying both data and errors is
+        returned as-is, leaving failed fields null, instead of raising.
+        """
+        self.request_count += 1
+        response = self.session.post(
+            GRAPHQL_URL,
+            json={'query': query, 'variables': variables or {}},
+            headers={'Authorization': f'bearer {self.token}'},
+            timeout=30
+        )
         try:
-            self.wait_for_rate_limit()
-            return self.github.get_repo(repo_name)
-        except GithubException as e:
-            logger.error(f"Error accessing repository {repo_name}: {e}")
-            return None
+            payload = response.json()
+        except ValueError:
+            payload = {'message': response.text}
+        
+        failed = payload.get('errors') and not (allow_partial and payload.get('data'))
+        if response.status_code != 200 or failed:
+            raise GithubException(response.status_code, payload, dict(response.headers))
+        return payload['data']
     
-    def create_issue_template(self, repo_name, template_type="bug_report"):
-        """Create issue templates for the repository"""
-        templates = {
-            "bug_report": {
-                "filename": "bug_report.md",
-                "content": """---
+    def paginate(self, query, variables, path):
+        """Yield the nodes of the connection at ``path``, following its cursor
+        
+        The query must accept a ``$cursor`` variable and select
+        ``pageInfo { hasNextPage endCursor }`` on the paginated connection;
+        a ``cursor`` in ``variables`` resumes after that point.
+        """
+        variables = {'cursor': None, **variables}
+        while True:
+            connection = self.execute(query, variables)
+            for field in path:
+                connection = connection.get(field) if connection else None
+            if not connection:
+                return
+            
+            yield from connection['nodes']
+            
+            if not connection['pageInfo']['hasNextPage']:
+                return
+            variables['cursor'] = connection['pageInfo']['endCursor']
+
+# Repository objects per (token, repo name), reused across calls within the TTL
+REPO_CACHE_TTL = 300
+_repo_cache = {}
+_repo_cache_lock = threading.Lock()
+
+# Repository templates, built once at import rather than on every call
+_BUG_REPORT_TEMPLATE = """---
 name: Bug report
 about: Create a report to help us improve
 title: '[BUG] '
@@ -86,10 +348,8 @@ If applicable, add screenshots to help explain your problem.
 **Additional context**
 Add any other context about the problem here.
 """
-            },
-            "feature_request": {
-                "filename": "feature_request.md",
-                "content": """---
+
+_FEATURE_REQUEST_TEMPLATE = """---
 name: Feature request
 about: Suggest an idea for this project
 title: '[FEATURE] '
@@ -109,35 +369,170 @@ A clear and concise description of any alternative solutions or features you've
 **Additional context**
 Add any other context or screenshots about the feature request here.
 """
+
+_PR_TEMPLATE = """## Description
+Brief description of the changes in this pull request.
+
+## Type of Change
+- [ ] Bug fix (non-breaking change which fixes an issue)
+- [ ] New feature (non-breaking change which adds functionality)
+- [ ] Breaking change (fix or feature that would cause existing functionality to not work as expected)
+- [ ] Documentation update
+
+## Testing
+- [ ] I have tested my changes
+- [ ] I have added tests that prove my fix is effective or that my feature works
+- [ ] New and existing unit tests pass locally with my changes
+
+## Checklist
+- [ ] My code follows the style guidelines of this project
+- [ ] I have performed a self-review of my own code
+- [ ] I have commented my code, particularly in hard-to-understand areas
+- [ ] I have made corresponding changes to the documentation
+- [ ] My changes generate no new warnings
+
+## Screenshots (if applicable)
+Add screenshots to help explain your changes.
+"""
+
+_ISSUE_TEMPLATES = {
+    "bug_report": {"filename": "bug_report.md", "content": _BUG_REPORT_TEMPLATE},
+    "feature_request": {"filename": "feature_request.md", "content": _FEATURE_REQUEST_TEMPLATE}
+}
+
+# Everything the setup checks read about a repository, in one request
+_REPOSITORY_PROBE_QUERY = """
+query($owner: String!, $name: String!) {
+  rateLimit { limit remaining resetAt }
+  repository(owner: $owner, name: $name) {
+    nameWithOwner
+    stargazerCount
+    forkCount
+    primaryLanguage { name }
+    viewerPermission
+    issues(first: 5, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { number title }
+    }
+    pullRequests(first: 5, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { number title }
+    }
+    languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+      totalSize
+      edges { size node { name } }
+    }
+  }
+}
+"""
+
+class GitHubUtils:
+    def __init__(self, token=None, tokens=None, pool=None):
+        self.token = token or Config.GITHUB_TOKEN
+        # An injected pool lets callers share already-built clients
+        self.pool = pool or GitHubClientPool(resolve_tokens(token, tokens))
+        self.graphql = GitHubGraphQL(self.token) if self.token else None
+        # Paths per repository from one recursive tree listing, shared by template checks
+        self._tree_paths = {}
+    
+    @property
+    def github(self):
+        """Next client in the token pool"""
+        return self.pool.get_client()
+        
+    def get_rate_limit_info(self):
+        """Get current rate limit information"""
+        rate_limit = self.github.get_rate_limit()
+        return {
+            'core': {
+                'limit': rate_limit.core.limit,
+                'remaining': rate_limit.core.remaining,
+                'reset': rate_limit.core.reset
+            },
+            'search': {
+                'limit': rate_limit.search.limit,
+                'remaining': rate_limit.search.remaining,
+                'reset': rate_limit.search.reset
             }
         }
+    
+    def wait_for_rate_limit(self):
+        """Wait if rate limit is exceeded on every pooled token"""
+        self.pool.wait_for_rate_limit()
+    
+    def get_repository_safely(self, repo_name):
+        """Get repository with error handling"""
+        key = (self.token, repo_name)
+        with _repo_cache_lock:
+            cached = _repo_cache.get(key)
+        if cached and time.time() - cached[0] < REPO_CACHE_TTL:
+            return cached[1]
         
+        try:
+            self.wait_for_rate_limit()
+            repo = self.github.get_repo(repo_name)
+        except GithubException as e:
+            logger.error(f"Error accessing repository {repo_name}: {e}")
+            return None
+        
+        with _repo_cache_lock:
+            _repo_cache[key] = (time.time(), repo)
+        return repo
+    
+    def invalidate_repository(self, repo_name):
+        """Drop the cached repository object after changing it"""
+        with _repo_cache_lock:
+            _repo_cache.pop((self.token, repo_name), None)
+    
+    def _path_exists(self, repo, path):
+        """Check for a file using one recursive tree listing per repository
+        
+        Avoids downloading file bodies via ``get_contents``, which is still used
+        when the tree is unavailable or truncated.
+        """
+        if repo.full_name not in self._tree_paths:
+            try:
+                tree = repo.get_git_tree(repo.default_branch, recursive=True)
+            except GithubException:
+                tree = None
+            
+            if tree is None or tree.raw_data.get('truncated'):
+                try:
+                    repo.get_contents(path)
+                    return True
+                except GithubException:
+                    return False
+            self._tree_paths[repo.full_name] = {entry.path for entry in tree.tree}
+        
+        return path in self._tree_paths[repo.full_name]
+    
+    def create_issue_template(self, repo_name, template_type="bug_report"):
+        """Create issue templates for the repository"""
         try:
             repo = self.get_repository_safely(repo_name)
             if not repo:
                 return False
             
-            template = templates.get(template_type)
+            template = _ISSUE_TEMPLATES.get(template_type)
             if not template:
                 return False
             
             # Create .github/ISSUE_TEMPLATE directory structure
             path = f".github/ISSUE_TEMPLATE/{template['filename']}"
             
-            try:
-                # Check if file exists
-                repo.get_contents(path)
+            if self._path_exists(repo, path):
                 logger.info(f"Template {path} already exists")
                 return True
-            except GithubException:
-                # File doesn't exist, create it
-                repo.create_file(
-                    path=path,
-                    message=f"Add {template_type} issue template",
-                    content=template['content']
-                )
-                logger.info(f"Created issue template: {path}")
-                return True
+            
+            repo.create_file(
+                path=path,
+                message=f"Add {template_type} issue template",
+                content=template['content']
+            )
+            self._tree_paths.get(repo.full_name, set()).add(path)
+            self.invalidate_repository(repo_name)
+            logger.info(f"Created issue template: {path}")
+            return True
         
         except Exception as e:
             logger.error(f"Error creating issue template: {e}")
@@ -166,18 +561,25 @@ Add any other context or screenshots about the feature request here.
                 return False
             
             existing_labels = {label.name for label in repo.get_labels()}
+            missing = [label for label in standard_labels if label['name'] not in existing_labels]
+            created = self._create_labels_batched(repo, missing) if missing else set()
             
-            for label_info in standard_labels:
-                if label_info['name'] not in existing_labels:
-                    try:
-                        repo.create_label(
-                            name=label_info['name'],
-                            color=label_info['color'],
-                            description=label_info.get('description', '')
-                        )
-                        logger.info(f"Created label: {label_info['name']}")
-                    except GithubException as e:
-                        logger.error(f"Error creating label {label_info['name']}: {e}")
+            def create_label(label_info):
+                try:
+                    repo.create_label(
+                        name=label_info['name'],
+                        color=label_info['color'],
+                        description=label_info.get('description', '')
+                    )
+                    logger.info(f"Created label: {label_info['name']}")
+                except GithubException as e:
+                    logger.error(f"Error creating label {label_info['name']}: {e}")
+            
+            remaining = [label for label in missing if label['name'] not in created]
+            if remaining:
+                # Each POST is network-bound, so issue them concurrently
+                with ThreadPoolExecutor(max_workers=6) as executor:
+                    list(executor.map(create_label, remaining))
             
             return True
         
@@ -185,6 +587,41 @@ Add any other context or screenshots about the feature request here.
             logger.error(f"Error setting up labels: {e}")
             return False
     
+    def _create_labels_batched(self, repo, labels):
+        """Create labels in one aliased GraphQL mutation, returning the names created
+        
+        Labels the mutation could not create are left for the REST fallback.
+        """
+        if not self.graphql:
+            return set()
+        
+        params = ['$repo: ID!']
+        fields = []
+        variables = {'repo': repo.node_id}
+        for i, label in enumerate(labels):
+            params.append(f'$name{i}: String!, $color{i}: String!, $description{i}: String')
+            fields.append(
+                f'l{i}: createLabel(input: {{repositoryId: $repo, name: $name{i}, '
+                f'color: $color{i}, description: $description{i}}}) {{ label {{ name }} }}'
+            )
+            variables.update({
+                f'name{i}': label['name'],
+                f'color{i}': label['color'],
+                f'description{i}': label.get('description', '')
+            })
+        mutation = f"mutation({', '.join(params)}) {{ {' '.join(fields)} }}"
+        
+        try:
+            data = self.graphql.execute(mutation, variables, allow_partial=True)
+        except (GithubException, requests.RequestException) as e:
+            logger.warning(f"Batched label creation failed, falling back to REST: {e}")
+            return set()
+        
+        created = {result['label']['name'] for result in data.values() if result and result.get('label')}
+        for name in created:
+            logger.info(f"Created label: {name}")
+        return created
+    
     def get_repository_languages(self, repo_name):
         """Get programming languages used in repository"""
         try:
@@ -210,6 +647,61 @@ Add any other context or screenshots about the feature request here.
             logger.error(f"Error getting repository languages: {e}")
             return {}
     
+    def probe_repository(self, repo_name):
+        """GraphQL rate limit, access, recent issues/PRs and languages of a repository in one request
+        
+        ``repository`` is None when the token can't see the repository; an
+        empty dict is returned when the request itself fails.
+        """
+        if not self.graphql:
+            logger.error("Probing a repository requires a GitHub token")
+            return {}
+        
+        owner, _, name = repo_name.partition('/')
+        try:
+            # A missing repository comes back as a null field next to the errors
+            data = self.graphql.execute(
+                _REPOSITORY_PROBE_QUERY, {'owner': owner, 'name': name}, allow_partial=True
+            )
+        except (GithubException, requests.RequestException) as e:
+            logger.error(f"Error probing repository {repo_name}: {e}")
+            return {}
+        
+        rate_limit = data.get('rateLimit') or {}
+        probe = {
+            'rate_limit': {
+                'limit': rate_limit.get('limit'),
+                'remaining': rate_limit.get('remaining'),
+                'reset': rate_limit.get('resetAt')
+            },
+            'repository': None
+        }
+        repo = data.get('repository')
+        if not repo:
+            return probe
+        
+        total = repo['languages']['totalSize']
+        probe['repository'] = {
+            'full_name': repo['nameWithOwner'],
+            'stars': repo['stargazerCount'],
+            'forks': repo['forkCount'],
+            'language': (repo.get('primaryLanguage') or {}).get('name'),
+            'permission': repo.get('viewerPermission'),
+            'issues': repo['issues']['nodes'],
+            'total_issues': repo['issues']['totalCount'],
+            'pull_requests': repo['pullRequests']['nodes'],
+            'total_pull_requests': repo['pullRequests']['totalCount'],
+            # Same shape as get_repository_languages
+            'languages': {
+                edge['node']['name']: {
+                    'bytes': edge['size'],
+                    'percentage': round(edge['size'] / total * 100, 2) if total > 0 else 0
+                }
+                for edge in repo['languages']['edges']
+            }
+        }
+        return probe
+    
     def get_repository_topics(self, repo_name):
         """Get repository topics/tags"""
         try:
@@ -235,6 +727,7 @@ Add any other context or screenshots about the feature request here.
             all_topics = list(current_topics.union(new_topics))
             
             repo.replace_topics(all_topics)
+            self.invalidate_repository(repo_name)
             logger.info(f"Updated topics for {repo_name}: {all_topics}")
             return True
         
@@ -244,31 +737,6 @@ Add any other context or screenshots about the feature request here.
     
     def create_pull_request_template(self, repo_name):
         """Create a pull request template"""
-        template_content = """## Description
-Brief description of the changes in this pull request.
-
-## Type of Change
-- [ ] Bug fix (non-breaking change which fixes an issue)
-- [ ] New feature (non-breaking change which adds functionality)
-- [ ] Breaking change (fix or feature that would cause existing functionality to not work as expected)
-- [ ] Documentation update
-
-## Testing
-- [ ] I have tested my changes
-- [ ] I have added tests that prove my fix is effective or that my feature works
-- [ ] New and existing unit tests pass locally with my changes
-
-## Checklist
-- [ ] My code follows the style guidelines of this project
-- [ ] I have performed a self-review of my own code
-- [ ] I have commented my code, particularly in hard-to-understand areas
-- [ ] I have made corresponding changes to the documentation
-- [ ] My changes generate no new warnings
-
-## Screenshots (if applicable)
-Add screenshots to help explain your changes.
-"""
-        
         try:
             repo = self.get_repository_safely(repo_name)
             if not repo:
@@ -276,18 +744,19 @@ Add screenshots to help explain your changes.
             
             path = ".github/pull_request_template.md"
             
-            try:
-                repo.get_contents(path)
+            if self._path_exists(repo, path):
                 logger.info("PR template already exists")
                 return True
-            except GithubException:
-                repo.create_file(
-                    path=path,
-                    message="Add pull request template",
-                    content=template_content
-                )
-                logger.info("Created PR template")
-                return True
+            
+            repo.create_file(
+                path=path,
+                message="Add pull request template",
+                content=_PR_TEMPLATE
+            )
+            self._tree_paths.get(repo.full_name, set()).add(path)
+            self.invalidate_repository(repo_name)
+            logger.info("Created PR template")
+            return True
         
         except Exception as e:
             logger.error(f"Error creating PR template: {e}")
@@ -0,0 +1,113 @@
+"""
+Shared settings for the Smart Repository Assistant configuration classes
+Keyword tables and thresholds are defined once and frozen against mutation
+"""
+import re
+from types import MappingProxyType
+
+class KeywordMatcher:
+    """Find which keyword groups occur in a text with a single regex scan"""
+    
+    def __init__(self, groups):
+        self.groups = {label: frozenset(map(str.lower, words)) for label, words in groups.items()}
+        keywords = set().union(*self.groups.values())
+        # Longest keyword first, so each match also implies every keyword that prefixes it
+        self.prefixes = {
+            keyword: [other for other in keywords if keyword.startswith(other)]
+            for keyword in keywords
+        }
+        alternatives = sorted(keywords, key=len, reverse=True)
+        # Zero-width lookahead so overlapping keywords are all found, as with ``in``
+        self.pattern = re.compile(f"(?=({'|'.join(map(re.escape, alternatives))}))")
+    
+    def scores(self, text):
+        """Number of distinct keywords from each group that appear anywhere in ``text``"""
+        return self.scores_lowered(text.lower())
+    
+    def scores_lowered(self, text_lower):
+        """Like ``scores`` for text the caller has already lowercased"""
+        found = set()
+        for match in self.pattern.finditer(text_lower):
+            found.update(self.prefixes[match.group(1)])
+        
+        # Built in group order, so ties resolve the same way as iterating the config
+        scores = {}
+        for label, words in self.groups.items():
+            score = len(words & found)
+            if score > 0:
+                scores[label] = score
+        return scores
+
+class _BaseConfig:
+    # Issue Classification Labels
+    ISSUE_LABELS = MappingProxyType({
+        'bug': ('bug', 'error', 'crash', 'broken', 'not working', 'fail'),
+        'feature': ('feature', 'enhancement', 'new', 'add', 'implement'),
+        'documentation': ('doc', 'documentation', 'readme', 'guide', 'help'),
+        'question': ('question', 'help', 'how to', 'support'),
+        'performance': ('performance', 'slow', 'optimization', 'speed'),
+        'security': ('security', 'vulnerability', 'auth', 'permission'),
+        'maintenance': ('maintenance', 'cleanup', 'refactor', 'update'),
+        'ci/cd': ('ci', 'cd', 'build', 'deploy', 'pipeline', 'test')
+    })
+    
+    # Priority Labels
+    PRIORITY_KEYWORDS = MappingProxyType({
+        'critical': ('critical', 'urgent', 'emergency', 'blocking'),
+        'high': ('high', 'important', 'asap'),
+        'medium': ('medium', 'normal'),
+        'low': ('low', 'minor', 'nice to have')
+    })
+    
+    # Pull request types, checked in this order; the first with any hit wins
+    PR_TYPE_KEYWORDS = MappingProxyType({
+        'bugfix': ('fix', 'bug', 'error', 'issue'),
+        'feature': ('feat', 'feature', 'add', 'new'),
+        'documentation': ('doc', 'documentation', 'readme'),
+        'refactor': ('refactor', 'cleanup', 'improve'),
+        'test': ('test', 'testing')
+    })
+    
+    # Colors for labels the bot creates; any other label gets DEFAULT_LABEL_COLOR
+    LABEL_COLORS = MappingProxyType({
+        'bug': 'd73a4a',
+        'feature': '0075ca',
+        'documentation': '0052cc',
+        'question': 'd876e3',
+        'enhancement': 'a2eeef',
+        'priority:critical': 'b60205',
+        'priority:high': 'd93f0b',
+        'priority:medium': 'fbca04',
+        'priority:low': '0e8a16',
+        'needs-attention': 'ff6b6b',
+        'size:small': 'c2e0c6',
+        'size:medium': 'f9d71c',
+        'size:large': 'dfa878',
+        'size:xl': 'd73a4a'
+    })
+    DEFAULT_LABEL_COLOR = '7057ff'
+    
+    # Lowercased, immutable keyword sets built once at import
+    ISSUE_LABEL_SETS = MappingProxyType({
+        label: frozenset(w.lower() for w in words) for label, words in ISSUE_LABELS.items()
+    })
+    PRIORITY_KEYWORD_SETS = MappingProxyType({
+        priority: frozenset(w.lower() for w in words) for priority, words in PRIORITY_KEYWORDS.items()
+    })
+    
+    ISSUE_LABEL_MATCHER = KeywordMatcher(ISSUE_LABEL_SETS)
+    PRIORITY_MATCHER = KeywordMatcher(PRIORITY_KEYWORD_SETS)
+    PR_TYPE_MATCHER = KeywordMatcher(PR_TYPE_KEYWORDS)
+    
+    # Repository Health Thresholds
+    HEALTH_THRESHOLDS = MappingProxyType({
+        'excellent': 90,
+        'good': 75,
+        'fair': 60,
+        'poor': 40
+    })
+    
+    @classmethod
+    def classify(cls, text):
+        """Keyword hit count per issue label for ``text``"""
+        return cls.ISSUE_LABEL_MATCHER.scores(text)
@@ -3,25 +3,200 @@ Smart Repository Assistant - Analytics Module
 Advanced repository analysis and health monitoring
 """
 
+import asyncio
+import functools
+import inspect
+import sqlite3
+import threading
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from collections import defaultdict, Counter
-from github import Github
+from datetime import datetime, timedelta, timezone
+from collections import defaultdict
 from config import Config
+from PyGithub import GitHubClientPool, GitHubGraphQL, resolve_tokens
+from cache_store import get_snapshot_store
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# GraphQL returns commit sizes, first comments and reviews inline, so one
+# request covers up to 100 records instead of a REST call per record
+_COMMITS_QUERY = """
+query($owner: String!, $name: String!, $since: GitTimestamp, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: 100, since: $since, after: $cursor) {
+            pageInfo { hasNextPage endCursor }
+            nodes {
+              oid
+              message
+              authoredDate
+              additions
+              deletions
+              author { name }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $since: DateTime, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: 100, after: $cursor, filterBy: {since: $since}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        state
+        createdAt
+        updatedAt
+        closedAt
+        author { login }
+        labels(first: 20) { nodes { name } }
+        comments(first: 100) {
+          pageInfo { hasNextPage endCursor }
+          nodes { createdAt author { login } }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Comments beyond the first page of an issue, resumed from its cursor
+_ISSUE_COMMENTS_QUERY = """
+query($owner: String!, $name: String!, $number: Int!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    issue(number: $number) {
+      comments(first: 100, after: $cursor) {
+        pageInfo { hasNextPage endCursor }
+        nodes { createdAt author { login } }
+      }
+    }
+  }
+}
+"""
+
+_PULLS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: 100, after: $cursor, orderBy: {field: UPDATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number
+        state
+        createdAt
+        updatedAt
+        mergedAt
+        additions
+        deletions
+        author { login }
+        reviews(first: 50) { nodes { author { login } } }
+      }
+    }
+  }
+}
+"""
+
+_MISSING = object()
+
+def cached_method(fn):
+    """Memoize an analyzer method in ``self.cache`` keyed by name and arguments"""
+    signature = inspect.signature(fn)
+    
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (fn.__name__, tuple(bound.arguments.values())[1:])
+        # Per-key lock so concurrent report sections share a single fetch
+        with self._cache_lock:
+            key_lock = self._cache_key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Returned from the local, since invalidate() may clear the cache at any point
+            result = self.cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = self.cache[key] = fn(self, *args, **kwargs)
+            return result
+    
+    return wrapper
+
 class RepositoryAnalyzer:
-    def __init__(self, repo_name=None, github_token=None):
+    def __init__(self, repo_name=None, github_token=None, github_tokens=None, use_cache=None, pool=None):
         self.github_token = github_token or Config.GITHUB_TOKEN
-        self.github = Github(self.github_token)
+        # An injected pool lets callers share already-built clients
+        self.pool = pool or GitHubClientPool(resolve_tokens(github_token, github_tokens))
+        self.github = self.pool.clients[0]
         self.repo_name = repo_name or Config.DEFAULT_REPO
         self.repo = self.github.get_repo(self.repo_name)
+        self._pooled_repos = {id(self.github): self.repo}
+        # GraphQL needs an authenticated token; anonymous use stays on REST
+        self.graphql = GitHubGraphQL(self.github_token) if self.github_token else None
         self.cache = {}
+        self._cache_lock = threading.Lock()
+        self._cache_key_locks = {}
+        # Snapshot of previously fetched records so repeat runs only pull deltas
+        self.store = None
+        if Config.ANALYTICS_CACHE_ENABLED if use_cache is None else use_cache:
+            try:
+                self.store = get_snapshot_store(Config.ANALYTICS_CACHE_PATH)
+            except sqlite3.Error as e:
+                print(f"Analytics cache unavailable: {e}")
+    
+    def invalidate(self):
+        """Drop memoized section results so the next call re-fetches from GitHub"""
+        # The analyzer may be shared (the dashboard's is per process), so clear
+        # under the same lock that hands out the per-key locks
+        with self._cache_lock:
+            self.cache.clear()
+        if self.store:
+            self.store.clear_basic_stats(self.repo_name)
+        # Repository attributes (stars, forks, ...) were loaded at construction;
+        # a conditional request refreshes them and costs nothing if unchanged
+        self.repo.update()
+    
+    def get_cache_status(self):
+        """How this analyzer's GitHub reads were served
+        
+        ``etag-304`` when every REST read revalidated unchanged (no rate-limit
+        cost), ``etag-partial`` when some did, ``network`` otherwise.
+        """
+        fetched = self.graphql.request_count if self.graphql else 0
+        not_modified = 0
+        for client in self.pool.clients:
+            stats = getattr(client._Github__requester, 'conditional_stats', {})
+            fetched += stats.get('fetched', 0)
+            not_modified += stats.get('not_modified', 0)
         
+        if not_modified and not fetched:
+            return 'etag-304'
+        return 'etag-partial' if not_modified else 'network'
+    
+    def _next_repo(self):
+        """Repository handle bound to the next client in the token pool, for bulk sweeps"""
+        client = self.pool.get_client()
+        if id(client) not in self._pooled_repos:
+            self._pooled_repos[id(client)] = client.get_repo(self.repo_name, lazy=True)
+        return self._pooled_repos[id(client)]
+        
+    @cached_method
     def get_basic_stats(self):
         """Get basic repository statistics"""
         try:
+            if self.store:
+                cached = self.store.get_basic_stats(self.repo_name, Config.ANALYTICS_UPDATE_INTERVAL)
+                if cached:
+                    return cached
+            
             stats = {
                 'name': self.repo.name,
                 'full_name': self.repo.full_name,
@@ -36,144 +211,135 @@ class RepositoryAnalyzer:
                 'updated_at': self.repo.updated_at,
                 'default_branch': self.repo.default_branch
             }
+            if self.store:
+                self.store.set_basic_stats(self.repo_name, stats)
             return stats
         except Exception as e:
             print(f"Error getting basic stats: {e}")
             return {}
     
+    @cached_method
     def get_commit_activity(self, days=30):
         """Analyze commit activity over the last N days"""
         try:
             since = datetime.now() - timedelta(days=days)
-            commits = list(self.repo.get_commits(since=since))
             
             # Daily commit counts
+            total_commits = 0
             daily_commits = defaultdict(int)
             commit_authors = defaultdict(int)
-            commit_details = []
+            latest_commits = []
             
-            for commit in commits:
-                date = commit.commit.author.date.date()
-                author = commit.commit.author.name
+            # Aggregate page by page as commits stream in
+            for commit in self._fetch_commits(since):
+                date = commit['date'].date()
+                author = commit['author']
                 
+                total_commits += 1
                 daily_commits[date.isoformat()] += 1
                 commit_authors[author] += 1
                 
-                commit_details.append({
-                    'sha': commit.sha[:7],
-                    'message': commit.commit.message.split('\n')[0][:100],
-                    'author': author,
-                    'date': commit.commit.author.date.isoformat(),
-                    'additions': commit.stats.additions if commit.stats else 0,
-                    'deletions': commit.stats.deletions if commit.stats else 0
-                })
+                if len(latest_commits) < 50:  # Latest 50 commits
+                    latest_commits.append(commit)
+            
+            # Only the detailed commits need sizes
+            self._fill_commit_stats(latest_commits)
+            commit_details = [{
+                'sha': commit['sha'][:7],
+                'message': commit['message'].split('\n')[0][:100],
+                'author': commit['author'],
+                'date': commit['date'].isoformat(),
+                'additions': commit['additions'],
+                'deletions': commit['deletions']
+            } for commit in latest_commits]
             
             return {
-                'total_commits': len(commits),
+                'total_commits': total_commits,
                 'daily_commits': dict(daily_commits),
                 'top_contributors': dict(sorted(commit_authors.items(), 
                                               key=lambda x: x[1], reverse=True)[:10]),
-                'commit_details': commit_details[:50]  # Latest 50 commits
+                'commit_details': commit_details
             }
         except Exception as e:
             print(f"Error analyzing commit activity: {e}")
             return {}
     
+    @cached_method
     def get_issue_analytics(self):
         """Comprehensive issue analysis"""
         try:
-            issues = list(self.repo.get_issues(state='all'))
+            issues = self._fetch_issues()
+            df = pd.DataFrame.from_records(
+                issues, columns=['state', 'created_at', 'closed_at', 'labels', 'comments']
+            )
+            created_at = pd.to_datetime(df['created_at'])
+            closed_at = pd.to_datetime(df['closed_at'])
+            first_comment_at = pd.to_datetime(pd.Series(
+                [comments[0]['created_at'] if comments else None for comments in df['comments']],
+                dtype=object
+            ))
             
             # Basic counts
-            open_issues = [i for i in issues if i.state == 'open']
-            closed_issues = [i for i in issues if i.state == 'closed']
+            total_issues = len(df)
+            closed_mask = df['state'] == 'closed'
+            open_issues = int((df['state'] == 'open').sum())
+            closed_issues = int(closed_mask.sum())
             
             # Label analysis
-            label_counts = Counter()
-            priority_counts = Counter()
+            labels = df['labels'].explode().dropna()
+            label_counts = labels.value_counts(sort=False).sort_values(ascending=False, kind='stable')
+            priority_counts = labels[labels.str.startswith('priority:')].value_counts(sort=False)
             
-            # Time to close analysis
-            close_times = []
-            
-            # Response times
-            response_times = []
-            
-            for issue in issues:
-                # Count labels
-                for label in issue.labels:
-                    label_counts[label.name] += 1
-                    
-                    if label.name.startswith('priority:'):
-                        priority_counts[label.name] += 1
-                
-                # Calculate time to close
-                if issue.state == 'closed' and issue.closed_at:
-                    time_diff = (issue.closed_at - issue.created_at).total_seconds() / 3600  # hours
-                    close_times.append(time_diff)
-                
-                # Calculate response time (time to first comment)
-                comments = list(issue.get_comments())
-                if comments:
-                    first_comment = comments[0]
-                    response_time = (first_comment.created_at - issue.created_at).total_seconds() / 3600
-                    response_times.append(response_time)
-            
-            # Calculate averages
-            avg_close_time = np.mean(close_times) if close_times else 0
-            avg_response_time = np.mean(response_times) if response_times else 0
+            # Time to close and time to first comment, in hours
+            close_times = ((closed_at - created_at)[closed_mask].dt.total_seconds() / 3600).dropna()
+            response_times = ((first_comment_at - created_at).dt.total_seconds() / 3600).dropna()
             
             return {
-                'total_issues': len(issues),
-                'open_issues': len(open_issues),
-                'closed_issues': len(closed_issues),
-                'close_rate': len(closed_issues) / len(issues) * 100 if issues else 0,
-                'avg_close_time_hours': avg_close_time,
-                'avg_response_time_hours': avg_response_time,
-                'label_distribution': dict(label_counts.most_common(10)),
-                'priority_distribution': dict(priority_counts),
-                'issues_by_month': self._group_issues_by_month(issues)
+                'total_issues': total_issues,
+                'open_issues': open_issues,
+                'closed_issues': closed_issues,
+                'close_rate': closed_issues / total_issues * 100 if total_issues else 0,
+                'avg_close_time_hours': close_times.mean() if not close_times.empty else 0,
+                'avg_response_time_hours': response_times.mean() if not response_times.empty else 0,
+                'label_distribution': label_counts.head(10).to_dict(),
+                'priority_distribution': priority_counts.to_dict(),
+                'issues_by_month': self._group_issues_by_month(created_at, closed_at)
             }
         except Exception as e:
             print(f"Error analyzing issues: {e}")
             return {}
     
+    @cached_method
     def get_pull_request_analytics(self):
         """Analyze pull request data"""
         try:
-            pulls = list(self.repo.get_pulls(state='all'))
+            pulls = self._fetch_pulls()
+            df = pd.DataFrame.from_records(
+                pulls, columns=['state', 'merged', 'created_at', 'merged_at', 'additions', 'deletions']
+            )
             
-            open_prs = [p for p in pulls if p.state == 'open']
-            closed_prs = [p for p in pulls if p.state == 'closed']
-            merged_prs = [p for p in pulls if p.merged]
+            total_prs = len(df)
+            open_prs = int((df['state'] == 'open').sum())
+            merged_prs = int(df['merged'].astype(bool).sum())
             
             # Size analysis
-            pr_sizes = defaultdict(int)
-            merge_times = []
+            sizes = pd.cut(
+                df['additions'] + df['deletions'],
+                bins=[-np.inf, 20, 100, 500, np.inf],
+                labels=['small', 'medium', 'large', 'xl'],
+                right=False
+            ).value_counts(sort=False)
             
-            for pr in pulls:
-                # Categorize by size
-                total_changes = pr.additions + pr.deletions
-                if total_changes < 20:
-                    pr_sizes['small'] += 1
-                elif total_changes < 100:
-                    pr_sizes['medium'] += 1
-                elif total_changes < 500:
-                    pr_sizes['large'] += 1
-                else:
-                    pr_sizes['xl'] += 1
-                
-                # Calculate merge time
-                if pr.merged_at:
-                    merge_time = (pr.merged_at - pr.created_at).total_seconds() / 3600
-                    merge_times.append(merge_time)
+            merge_times = ((pd.to_datetime(df['merged_at']) - pd.to_datetime(df['created_at']))
+                           .dt.total_seconds() / 3600).dropna()
             
             return {
-                'total_prs': len(pulls),
-                'open_prs': len(open_prs),
-                'merged_prs': len(merged_prs),
-                'merge_rate': len(merged_prs) / len(pulls) * 100 if pulls else 0,
-                'avg_merge_time_hours': np.mean(merge_times) if merge_times else 0,
-                'pr_size_distribution': dict(pr_sizes)
+                'total_prs': total_prs,
+                'open_prs': open_prs,
+                'merged_prs': merged_prs,
+                'merge_rate': merged_prs / total_prs * 100 if total_prs else 0,
+                'avg_merge_time_hours': merge_times.mean() if not merge_times.empty else 0,
+                'pr_size_distribution': {size: int(count) for size, count in sizes.items() if count}
             }
         except Exception as e:
             print(f"Error analyzing PRs: {e}")
@@ -184,128 +350,387 @@ class RepositoryAnalyzer:
         try:
             since = datetime.now() - timedelta(days=days)
             
-            # Get commits, issues, and PRs
-            commits = list(self.repo.get_commits(since=since))
-            issues = list(self.repo.get_issues(state='all', since=since))
-            pulls = list(self.repo.get_pulls(state='all'))
+            # Get commits, issues, and PRs; the listings are independent, so fetch them concurrently
+            commits, issues, pulls = _run_concurrently(
+                lambda: list(self._fetch_commits(since)),
+                lambda: list(self._fetch_issues(since)),
+                self._fetch_pulls
+            )
             
-            contributor_stats = defaultdict(lambda: {
-                'commits': 0,
-                'issues_opened': 0,
-                'issues_commented': 0,
-                'prs_opened': 0,
-                'prs_reviewed': 0,
-                'lines_added': 0,
-                'lines_deleted': 0
-            })
-            
-            # Analyze commits
-            for commit in commits:
-                author = commit.commit.author.name
-                contributor_stats[author]['commits'] += 1
-                if commit.stats:
-                    contributor_stats[author]['lines_added'] += commit.stats.additions
-                    contributor_stats[author]['lines_deleted'] += commit.stats.deletions
-            
-            # Analyze issues
-            for issue in issues:
-                author = issue.user.login if issue.user else 'Unknown'
-                contributor_stats[author]['issues_opened'] += 1
-                
-                # Count comments
-                for comment in issue.get_comments():
-                    commenter = comment.user.login if comment.user else 'Unknown'
-                    contributor_stats[commenter]['issues_commented'] += 1
+            lines = self._lines_by_author(commits, since)
+            comments = [comment['user'] for issue in issues for comment in issue['comments']]
+            reviews = [reviewer for pr in pulls for reviewer in pr['reviewers']]
             
-            # Analyze PRs
-            for pr in pulls:
-                author = pr.user.login if pr.user else 'Unknown'
-                contributor_stats[author]['prs_opened'] += 1
-                
-                # Count reviews
-                for review in pr.get_reviews():
-                    reviewer = review.user.login if review.user else 'Unknown'
-                    contributor_stats[reviewer]['prs_reviewed'] += 1
+            # Count each kind of event per contributor and align them into one table
+            contributor_stats = pd.concat({
+                'commits': pd.Series([commit['author'] for commit in commits], dtype=object).value_counts(sort=False),
+                'issues_opened': pd.Series([issue['user'] for issue in issues], dtype=object).value_counts(sort=False),
+                'issues_commented': pd.Series(comments, dtype=object).value_counts(sort=False),
+                'prs_opened': pd.Series([pr['user'] for pr in pulls], dtype=object).value_counts(sort=False),
+                'prs_reviewed': pd.Series(reviews, dtype=object).value_counts(sort=False),
+                'lines_added': pd.Series({author: added for author, (added, _) in lines.items()}, dtype='int64'),
+                'lines_deleted': pd.Series({author: deleted for author, (_, deleted) in lines.items()}, dtype='int64')
+            }, axis=1).fillna(0).astype(int)
             
-            return dict(contributor_stats)
+            return contributor_stats.to_dict(orient='index')
         except Exception as e:
             print(f"Error analyzing contributors: {e}")
             return {}
     
-    def calculate_health_score(self):
-        """Calculate overall repository health score (0-100)"""
+    def calculate_health_score(self, basic=None, commits=None, issues=None, prs=None):
+        """Calculate overall repository health score (0-100)
+        
+        Already-fetched section dicts can be passed in to skip fetching them.
+        """
         try:
-            score = 0
-            max_score = 100
-            
-            # Basic repo metrics (30 points)
-            basic_stats = self.get_basic_stats()
-            if basic_stats.get('description'):
-                score += 5
-            if basic_stats.get('stars', 0) > 10:
-                score += 5
-            if basic_stats.get('forks', 0) > 5:
-                score += 5
-            
-            # Recent activity (25 points)
-            commit_activity = self.get_commit_activity(30)
-            recent_commits = commit_activity.get('total_commits', 0)
-            if recent_commits > 0:
-                score += min(15, recent_commits)  # Up to 15 points for commits
-            
-            # Issue management (25 points)
-            issue_stats = self.get_issue_analytics()
-            close_rate = issue_stats.get('close_rate', 0)
-            score += min(15, close_rate * 0.15)  # Up to 15 points for close rate
-            
-            response_time = issue_stats.get('avg_response_time_hours', float('inf'))
-            if response_time < 24:  # Less than 1 day
-                score += 10
-            elif response_time < 72:  # Less than 3 days
-                score += 5
-            
-            # PR management (20 points)
-            pr_stats = self.get_pull_request_analytics()
-            merge_rate = pr_stats.get('merge_rate', 0)
-            score += min(10, merge_rate * 0.1)  # Up to 10 points for merge rate
-            
-            merge_time = pr_stats.get('avg_merge_time_hours', float('inf'))
-            if merge_time < 48:  # Less than 2 days
-                score += 10
-            elif merge_time < 168:  # Less than 1 week
-                score += 5
-            
-            return min(100, max(0, score))
+            return self._score_health(
+                basic if basic is not None else self.get_basic_stats(),
+                commits if commits is not None else self.get_commit_activity(30),
+                issues if issues is not None else self.get_issue_analytics(),
+                prs if prs is not None else self.get_pull_request_analytics()
+            )
         except Exception as e:
             print(f"Error calculating health score: {e}")
             return 0
     
-    def _group_issues_by_month(self, issues):
-        """Group issues by month for trend analysis"""
-        monthly_counts = defaultdict(lambda: {'opened': 0, 'closed': 0})
+    def _score_health(self, basic_stats, commit_activity, issue_stats, pr_stats):
+        """Score repository health from already-fetched section data"""
+        score = 0
         
-        for issue in issues:
-            created_month = issue.created_at.strftime('%Y-%m')
-            monthly_counts[created_month]['opened'] += 1
-            
-            if issue.closed_at:
-                closed_month = issue.closed_at.strftime('%Y-%m')
-                monthly_counts[closed_month]['closed'] += 1
+        # Basic repo metrics (30 points)
+        if basic_stats.get('description'):
+            score += 5
+        if basic_stats.get('stars', 0) > 10:
+            score += 5
+        if basic_stats.get('forks', 0) > 5:
+            score += 5
+        
+        # Recent activity (25 points)
+        recent_commits = commit_activity.get('total_commits', 0)
+        if recent_commits > 0:
+            score += min(15, recent_commits)  # Up to 15 points for commits
         
-        return dict(monthly_counts)
+        # Issue management (25 points)
+        close_rate = issue_stats.get('close_rate', 0)
+        score += min(15, close_rate * 0.15)  # Up to 15 points for close rate
+        
+        response_time = issue_stats.get('avg_response_time_hours', float('inf'))
+        if response_time < 24:  # Less than 1 day
+            score += 10
+        elif response_time < 72:  # Less than 3 days
+            score += 5
+        
+        # PR management (20 points)
+        merge_rate = pr_stats.get('merge_rate', 0)
+        score += min(10, merge_rate * 0.1)  # Up to 10 points for merge rate
+        
+        merge_time = pr_stats.get('avg_merge_time_hours', float('inf'))
+        if merge_time < 48:  # Less than 2 days
+            score += 10
+        elif merge_time < 168:  # Less than 1 week
+            score += 5
+        
+        return min(100, max(0, score))
+    
+    def _fetch_commits(self, since):
+        """Commits since a point in time, served from the snapshot cache when enabled"""
+        if self.store:
+            return self._sync_commits(since)
+        return self._stream_commits(since)
+    
+    def _fetch_issues(self, since=None):
+        """Issues (optionally updated since a point in time), served from the snapshot cache when enabled"""
+        if self.store:
+            issues = self._sync_issues()
+            if since is None:
+                return issues
+            cutoff = _to_naive_utc(since)
+            return [issue for issue in issues if issue['updated_at'] >= cutoff]
+        return self._stream_issues(since)
+    
+    @cached_method
+    def _sync_issues(self):
+        """Bring the issue snapshot up to date once per analyzer run"""
+        return self._sync_records('issues', 'number', self._changed_issues)
+    
+    @cached_method
+    def _fetch_pulls(self):
+        """Fetch all pull requests, with their reviewers, as plain records"""
+        if self.store:
+            return self._sync_records('pulls', 'number', lambda last_seen: list(self._stream_pulls(last_seen)))
+        return list(self._stream_pulls())
+    
+    def _sync_records(self, kind, key, fetch_changed):
+        """Merge records updated after the newest cached one into the snapshot and return all of them"""
+        synced = self.store.covered_since(kind, self.repo_name) is not None
+        last_seen = self.store.latest(kind, self.repo_name) if synced else None
+        self.store.upsert(kind, self.repo_name, fetch_changed(last_seen), key)
+        self.store.set_covered_since(kind, self.repo_name, None)
+        return self.store.load(kind, self.repo_name)
+    
+    def _sync_commits(self, since):
+        """Re-list the window's commits into the snapshot, keeping sizes already fetched
+        
+        The listing filters by commit date while history order isn't, so a merged
+        branch can bring in commits older than the newest stored one; a delta from
+        that point would miss them. Re-listing is cheap: REST pages replay from ETags
+        and unchanged commits keep the sizes stored for them.
+        """
+        stored = {record['sha']: record for record in self.store.load('commits', self.repo_name)}
+        
+        records = list(self._stream_commits(since))
+        for record in records:
+            previous = stored.get(record['sha'])
+            if record['additions'] is None and previous and previous['additions'] is not None:
+                record['additions'] = previous['additions']
+                record['deletions'] = previous['deletions']
+        self.store.upsert('commits', self.repo_name, records, 'sha')
+        return records
+    
+    def _changed_issues(self, last_seen):
+        """Issues updated after ``last_seen``, keeping cached comments the REST delta sweep omits"""
+        records = list(self._stream_issues(last_seen and last_seen.replace(tzinfo=timezone.utc)))
+        if self.graphql or last_seen is None:
+            return records
+        
+        previous = {record['number']: record['comments'] for record in self.store.load('issues', self.repo_name)}
+        for record in records:
+            fetched = {(comment['user'], comment['created_at']) for comment in record['comments']}
+            kept = [comment for comment in previous.get(record['number'], [])
+                    if (comment['user'], comment['created_at']) not in fetched]
+            record['comments'] = sorted(kept + record['comments'], key=lambda comment: comment['created_at'])
+        return records
+    
+    def _stream_commits(self, since):
+        """Stream commits since a point in time as plain records"""
+        if self.graphql:
+            nodes = self.graphql.paginate(
+                _COMMITS_QUERY,
+                {**self._graphql_repo_vars(), 'since': _to_github_timestamp(since)},
+                ('repository', 'defaultBranchRef', 'target', 'history')
+            )
+            for node in nodes:
+                yield {
+                    'sha': node['oid'],
+                    'message': node['message'],
+                    'author': (node['author'] or {}).get('name') or 'Unknown',
+                    'date': _parse_github_datetime(node['authoredDate']),
+                    'additions': node['additions'],
+                    'deletions': node['deletions']
+                }
+            return
+        
+        for commit in self._next_repo().get_commits(since=since):
+            yield {
+                'sha': commit.sha,
+                'message': commit.commit.message,
+                'author': commit.commit.author.name,
+                'login': commit.author.login if commit.author else None,
+                'date': commit.commit.author.date,
+                # REST listings carry no sizes and each commit's stats cost a
+                # request, so they are filled in only where needed
+                'additions': None,
+                'deletions': None
+            }
+    
+    def _fill_commit_stats(self, commits):
+        """Fetch sizes for commits listed without them, one request per commit"""
+        unsized = [commit for commit in commits if commit['additions'] is None]
+        if not unsized:
+            return
+        
+        repo = self._next_repo()
+        for commit in unsized:
+            stats = repo.get_commit(commit['sha']).stats
+            commit['additions'] = stats.additions if stats else 0
+            commit['deletions'] = stats.deletions if stats else 0
+        if self.store:
+            self.store.upsert('commits', self.repo_name, unsized, 'sha')
+    
+    def _lines_by_author(self, commits, since):
+        """Lines added and deleted per commit author over the window
+        
+        Sizes missing from REST listings come from one ``/stats/contributors``
+        call (weekly totals per login, so the window is rounded to whole
+        weeks) rather than a request per commit. Per-commit stats are only
+        fetched while GitHub is still computing those statistics.
+        """
+        lines = defaultdict(lambda: [0, 0])
+        stats = None
+        if any(commit['additions'] is None for commit in commits):
+            stats = self._next_repo().get_stats_contributors()
+            if stats is None:
+                self._fill_commit_stats(commits)
+        
+        if stats is None:
+            for commit in commits:
+                lines[commit['author']][0] += commit['additions']
+                lines[commit['author']][1] += commit['deletions']
+            return lines
+        
+        names = {commit['login']: commit['author'] for commit in commits if commit.get('login')}
+        cutoff = _to_naive_utc(since)
+        for contributor in stats:
+            login = contributor.author.login if contributor.author else None
+            if login not in names:
+                continue
+            for week in contributor.weeks:
+                if week.w + timedelta(days=7) > cutoff:
+                    lines[names[login]][0] += week.a
+                    lines[names[login]][1] += week.d
+        return lines
+    
+    def _stream_issues(self, since=None):
+        """Stream issues (optionally updated since a point in time) as plain records"""
+        if self.graphql:
+            nodes = self.graphql.paginate(
+                _ISSUES_QUERY,
+                {**self._graphql_repo_vars(), 'since': since and _to_github_timestamp(since)},
+                ('repository', 'issues')
+            )
+            for node in nodes:
+                comments = node['comments']['nodes']
+                if node['comments']['pageInfo']['hasNextPage']:
+                    comments = comments + list(self.graphql.paginate(
+                        _ISSUE_COMMENTS_QUERY,
+                        {**self._graphql_repo_vars(), 'number': node['number'],
+                         'cursor': node['comments']['pageInfo']['endCursor']},
+                        ('repository', 'issue', 'comments')
+                    ))
+                yield {
+                    'number': node['number'],
+                    'state': node['state'].lower(),
+                    'created_at': _parse_github_datetime(node['createdAt']),
+                    'updated_at': _parse_github_datetime(node['updatedAt']),
+                    'closed_at': _parse_github_datetime(node['closedAt']),
+                    'labels': [label['name'] for label in node['labels']['nodes']],
+                    'user': _graphql_login(node['author']),
+                    'comments': [{
+                        'user': _graphql_login(comment['author']),
+                        'created_at': _parse_github_datetime(comment['createdAt'])
+                    } for comment in comments]
+                }
+            return
+        
+        # A full listing needs every comment; a delta sync only the recent ones
+        comments_by_issue = self._get_comments_by_issue(since if self.store else None)
+        repo = self._next_repo()
+        listing = repo.get_issues(state='all', since=since) if since else repo.get_issues(state='all')
+        for issue in listing:
+            # The REST listing includes pull requests, GraphQL's issues don't; html_url
+            # tells them apart without the per-issue GET that ``pull_request`` triggers
+            if '/pull/' in issue.html_url:
+                continue
+            yield {
+                'number': issue.number,
+                'state': issue.state,
+                'created_at': issue.created_at,
+                'updated_at': issue.updated_at,
+                'closed_at': issue.closed_at,
+                'labels': [label.name for label in issue.labels],
+                'user': issue.user.login if issue.user else 'Unknown',
+                'comments': comments_by_issue.get(issue.url, [])
+            }
+    
+    def _stream_pulls(self, updated_after=None):
+        """Stream pull requests, most recently updated first, stopping at ``updated_after``"""
+        if self.graphql:
+            nodes = self.graphql.paginate(
+                _PULLS_QUERY, self._graphql_repo_vars(), ('repository', 'pullRequests')
+            )
+            for node in nodes:
+                updated_at = _parse_github_datetime(node['updatedAt'])
+                if updated_after and updated_at <= updated_after:
+                    return
+                yield {
+                    'number': node['number'],
+                    'state': 'open' if node['state'] == 'OPEN' else 'closed',
+                    'merged': node['mergedAt'] is not None,
+                    'created_at': _parse_github_datetime(node['createdAt']),
+                    'updated_at': updated_at,
+                    'merged_at': _parse_github_datetime(node['mergedAt']),
+                    'additions': node['additions'],
+                    'deletions': node['deletions'],
+                    'user': _graphql_login(node['author']),
+                    'reviewers': [_graphql_login(review['author']) for review in node['reviews']['nodes']]
+                }
+            return
+        
+        for pr in self._next_repo().get_pulls(state='all', sort='updated', direction='desc'):
+            if updated_after and pr.updated_at <= updated_after:
+                return
+            yield {
+                'number': pr.number,
+                'state': pr.state,
+                'merged': pr.merged,
+                'created_at': pr.created_at,
+                'updated_at': pr.updated_at,
+                'merged_at': pr.merged_at,
+                'additions': pr.additions,
+                'deletions': pr.deletions,
+                'user': pr.user.login if pr.user else 'Unknown',
+                'reviewers': [review.user.login if review.user else 'Unknown'
+                              for review in pr.get_reviews()]
+            }
+    
+    @cached_method
+    def _get_comments_by_issue(self, since=None):
+        """Fetch every issue comment in one paginated sweep, grouped by issue URL
+        
+        Replaces a ``get_comments()`` call per issue; comments are sorted by
+        creation time so the first entry per issue is its first response.
+        """
+        comments_by_issue = defaultdict(list)
+        kwargs = {'since': since} if since else {}
+        for comment in self._next_repo().get_issues_comments(sort='created', direction='asc', **kwargs):
+            comments_by_issue[comment.issue_url].append({
+                'user': comment.user.login if comment.user else 'Unknown',
+                'created_at': comment.created_at
+            })
+        return dict(comments_by_issue)
+    
+    def _graphql_repo_vars(self):
+        owner, name = self.repo_name.split('/', 1)
+        return {'owner': owner, 'name': name}
+    
+    def _group_issues_by_month(self, created_at, closed_at):
+        """Group issue open/close timestamps by month for trend analysis"""
+        opened = created_at.dt.strftime('%Y-%m').value_counts()
+        closed = closed_at.dropna().dt.strftime('%Y-%m').value_counts()
+        
+        return {
+            month: {'opened': int(opened.get(month, 0)), 'closed': int(closed.get(month, 0))}
+            for month in sorted(opened.index.union(closed.index))
+        }
     
     def get_comprehensive_report(self):
         """Get a comprehensive analytics report"""
         try:
+            # Sections are independent and I/O-bound, so fetch them concurrently
+            # and score health from the results instead of fetching them again
+            (basic_stats, commit_activity, issue_analytics,
+             pr_analytics, contributor_activity) = _run_concurrently(
+                self.get_basic_stats,
+                lambda: self.get_commit_activity(30),
+                self.get_issue_analytics,
+                self.get_pull_request_analytics,
+                self.get_contributor_activity
+            )
+            
             return {
                 'generated_at': datetime.now().isoformat(),
                 'repository': self.repo_name,
-                'basic_stats': self.get_basic_stats(),
-                'health_score': self.calculate_health_score(),
-                'commit_activity': self.get_commit_activity(),
-                'issue_analytics': self.get_issue_analytics(),
-                'pr_analytics': self.get_pull_request_analytics(),
-                'contributor_activity': self.get_contributor_activity()
+                'basic_stats': basic_stats,
+                'health_score': self.calculate_health_score(
+                    basic=basic_stats,
+                    commits=commit_activity,
+                    issues=issue_analytics,
+                    prs=pr_analytics
+                ),
+                'commit_activity': commit_activity,
+                'issue_analytics': issue_analytics,
+                'pr_analytics': pr_analytics,
+                'contributor_activity': contributor_activity
             }
         except Exception as e:
             print(f"Error generating comprehensive report: {e}")
@@ -319,11 +744,52 @@ class RepositoryAnalyzer:
         
         report = self.get_comprehensive_report()
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, default=str)
+        # Serialize one top-level section at a time so only that section's
+        # encoded bytes are held in memory alongside the report
+        with open(filename, 'wb') as f:
+            f.write(b'{')
+            for i, (key, value) in enumerate(report.items()):
+                f.write(b',\n  ' if i else b'\n  ')
+                f.write(_dump_json(key) + b': ' + _dump_json(value).replace(b'\n', b'\n  '))
+            f.write(b'\n}' if report else b'}')
         
         return filename
 
+def _dump_json(value):
+    """Encode a value as indented JSON bytes, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        # Datetimes go through ``str`` to match the stdlib fallback's output
+        return orjson.dumps(
+            value,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                   | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return json.dumps(value, indent=2, default=str).encode('utf-8')
+
+def _parse_github_datetime(value):
+    """Parse a GitHub ISO-8601 UTC timestamp into a naive datetime like PyGithub's"""
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%SZ') if value else None
+
+def _to_github_timestamp(value):
+    """Format a local naive datetime as a GitHub UTC timestamp"""
+    return value.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def _to_naive_utc(value):
+    """Convert a local naive or aware datetime to the naive UTC form GitHub records use"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+def _graphql_login(actor):
+    """Login of a GraphQL actor, which is null for deleted accounts"""
+    return actor['login'] if actor else 'Unknown'
+
+def _run_concurrently(*calls):
+    """Run blocking calls on worker threads and return their results in order"""
+    async def gather():
+        return await asyncio.gather(*(asyncio.to_thread(call) for call in calls))
+    
+    return asyncio.run(gather())
+
 # Legacy compatibility
 def get_repo_analytics(repo_name):
     """Get repository analytics (legacy function)"""
@@ -3,46 +3,210 @@ Smart Repository Assistant - Flask Application
 Main webhook server and API endpoints
 """
 
+import gzip
 import hmac
-import hashlib
 import json
-from flask import Flask, request, jsonify, render_template_string
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from cachetools import TTLCache
+from flask import Flask, Response, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from werkzeug.exceptions import BadRequest
 from issue_bot import SmartIssueBot, process_issue
-from analytics import RepositoryAnalyzer
 from config import Config
 import logging
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, keeping the default provider's sorted keys"""
+    
+    def dumps(self, obj, **kwargs):
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
 app.config['SECRET_KEY'] = Config.GITHUB_WEBHOOK_SECRET
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
 
 # Initialize components
 issue_bot = SmartIssueBot()
 
+# Webhook events are acknowledged immediately and processed in the background,
+# so slow GitHub API calls never hold up the response GitHub waits on
+_webhook_queue = queue.Queue(maxsize=1000)
+_WEBHOOK_HANDLERS = {
+    "issues": issue_bot.process_issue,
+    "pull_request": issue_bot.process_pull_request
+}
+
+# Recent X-GitHub-Delivery ids, to drop GitHub's redeliveries of the same event
+_recent_deliveries = OrderedDict()
+_recent_deliveries_lock = threading.Lock()
+_MAX_RECENT_DELIVERIES = 1000
+
+# Only these actions are acted on, and each re-classifies from scratch, so a
+# burst of them for one issue/PR needs only its latest payload processed
+_DEBOUNCED_ACTIONS = frozenset(('opened', 'edited'))
+
+def _debounce_key(event_type, payload):
+    """(event, repo, number) for events that may be coalesced, None otherwise"""
+    if payload.get('action') not in _DEBOUNCED_ACTIONS:
+        return None
+    repo_name = (payload.get('repository') or {}).get('full_name')
+    number = (payload.get('issue') or payload.get('pull_request') or {}).get('number')
+    if repo_name is None or number is None:
+        return None
+    return event_type, repo_name, number
+
+def _dispatch_webhook(event_type, payload):
+    try:
+        _WEBHOOK_HANDLERS[event_type](payload)
+    except Exception as e:
+        logger.error(f"Background {event_type} processing error: {e}")
+
+def _webhook_worker():
+    """Process queued webhook events, coalescing bursts for the same issue or PR"""
+    debounce = Config.WEBHOOK_DEBOUNCE_SECONDS
+    pending = {}  # debounce key -> (last received, event type, latest payload)
+    while True:
+        timeout = None
+        if pending:
+            oldest = min(received for received, _, _ in pending.values())
+            timeout = max(0, oldest + debounce - time.monotonic())
+        try:
+            event_type, payload = _webhook_queue.get(timeout=timeout)
+        except queue.Empty:
+            pass
+        else:
+            key = _debounce_key(event_type, payload) if debounce > 0 else None
+            if key is None:
+                _dispatch_webhook(event_type, payload)
+            else:
+                pending[key] = (time.monotonic(), event_type, payload)
+            _webhook_queue.task_done()
+        
+        now = time.monotonic()
+        for key in [key for key, (received, _, _) in pending.items() if now - received >= debounce]:
+            _, event_type, payload = pending.pop(key)
+            _dispatch_webhook(event_type, payload)
+
+threading.Thread(target=_webhook_worker, name="webhook-worker", daemon=True).start()
+
+def _seen_delivery(delivery_id):
+    """Record a delivery id, returning True if it was already received"""
+    if not delivery_id:
+        return False
+    with _recent_deliveries_lock:
+        if delivery_id in _recent_deliveries:
+            return True
+        _recent_deliveries[delivery_id] = None
+        if len(_recent_deliveries) > _MAX_RECENT_DELIVERIES:
+            _recent_deliveries.popitem(last=False)
+    return False
+
+# Analyzer results per (repo, method), so repeat requests skip the GitHub API
+_analytics_cache = TTLCache(maxsize=512, ttl=Config.ANALYTICS_UPDATE_INTERVAL)
+_analytics_cache_lock = threading.RLock()
+# Fetches currently running per cache key, so concurrent misses share one fetch
+_inflight = {}
+
+def cached_call(repo_name, method_name, fn, refresh=None):
+    """Return ``fn()`` memoized per repository and method; ``?no_cache=1`` forces a refresh"""
+    key = (repo_name, method_name)
+    if refresh is None:
+        refresh = request.args.get('no_cache') == '1'
+    with _analytics_cache_lock:
+        if not refresh and key in _analytics_cache:
+            return _analytics_cache[key]
+        inflight = _inflight.get(key)
+        owner = inflight is None
+        if owner:
+            inflight = _inflight[key] = Future()
+    
+    if not owner:
+        # Another request is already fetching this; share its result
+        return inflight.result()
+    
+    try:
+        result = fn()
+    except Exception as e:
+        with _analytics_cache_lock:
+            _inflight.pop(key, None)
+        inflight.set_exception(e)
+        raise
+    
+    with _analytics_cache_lock:
+        if result:  # Analyzer methods return empty results on errors; don't pin those
+            _analytics_cache[key] = result
+        _inflight.pop(key, None)
+    inflight.set_result(result)
+    return result
+
+class _LazyAnalyzer:
+    """Build the analyzer on first use so fully cached requests never touch GitHub"""
+    
+    def __init__(self, repo_name, refresh=None):
+        self.repo_name = repo_name
+        self.analyzer = None
+        # Same ``?no_cache=1`` switch as cached_call, so a forced refresh skips stored stats too
+        self.refresh = request.args.get('no_cache') == '1' if refresh is None else refresh
+    
+    def __call__(self):
+        if self.analyzer is None:
+            # Imported on first use: pandas and the analytics stack are only
+            # needed by the analytics endpoints, not the webhook path
+            from analytics import RepositoryAnalyzer
+            self.analyzer = RepositoryAnalyzer(self.repo_name)
+            if self.refresh and self.analyzer.store:
+                self.analyzer.store.clear_basic_stats(self.repo_name)
+        return self.analyzer
+    
+    def cache_status(self):
+        """'memory' when the TTL cache answered, otherwise how GitHub served the reads"""
+        return self.analyzer.get_cache_status() if self.analyzer else 'memory'
+
+# Encoded once; the secret is fixed for the life of the process
+_SECRET_BYTES = Config.GITHUB_WEBHOOK_SECRET.encode() if Config.GITHUB_WEBHOOK_SECRET else None
+
 def verify_webhook_signature(payload_body, signature_header):
     """Verify GitHub webhook signature"""
-    if not Config.GITHUB_WEBHOOK_SECRET:
+    if _SECRET_BYTES is None:
         return True  # Skip verification if no secret configured
     
-    if not signature_header:
+    if not signature_header or not signature_header.startswith("sha256="):
         return False
     
-    expected_signature = hmac.new(
-        Config.GITHUB_WEBHOOK_SECRET.encode(),
-        payload_body,
-        hashlib.sha256
-    ).hexdigest()
+    try:
+        provided = bytes.fromhex(signature_header[7:])
+    except ValueError:
+        return False
     
-    return hmac.compare_digest(f"sha256={expected_signature}", signature_header)
+    # One-shot digest runs entirely in OpenSSL (SHA extensions where the CPU has them)
+    expected = hmac.digest(_SECRET_BYTES, payload_body, 'sha256')
+    return hmac.compare_digest(expected, provided)
 
-@app.route("/", methods=["GET"])
-def home():
-    """Home page with basic information"""
-    html_template = """
+# The home page is static, so it is built (and compressed) once at import
+_HOME_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -98,35 +262,82 @@ def home():
     </body>
     </html>
     """
-    return render_template_string(html_template)
+_HOME_HTML_GZ = gzip.compress(_HOME_HTML.encode('utf-8'))
+
+@app.route("/", methods=["GET"])
+def home():
+    """Home page with basic information"""
+    if 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = Response(_HOME_HTML_GZ, mimetype="text/html")
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(_HOME_HTML, mimetype="text/html")
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+# Dynamic HTML/JSON responses at least this large are gzipped for clients that accept it
+_COMPRESS_MIMETYPES = ('application/json', 'text/html')
+_COMPRESS_MIN_SIZE = 500
+_COMPRESS_LEVEL = 6
+
+@app.after_request
+def compress_response(response):
+    """Gzip large JSON/HTML bodies that aren't already encoded"""
+    if (response.direct_passthrough
+            or not 200 <= response.status_code < 300
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in _COMPRESS_MIMETYPES
+            or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+        return response
+    
+    body = response.get_data()
+    if len(body) < _COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, compresslevel=_COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route("/webhook", methods=["POST"])
 def webhook():
     """GitHub webhook endpoint"""
     try:
+        # Read the body once, uncached; the same bytes are verified and parsed
+        body = request.get_data(cache=False)
+        
         # Verify signature
         signature = request.headers.get('X-Hub-Signature-256')
-        if not verify_webhook_signature(request.data, signature):
+        if not verify_webhook_signature(body, signature):
             logger.warning("Invalid webhook signature")
             return jsonify({"error": "Invalid signature"}), 401
         
         # Get event type
         event_type = request.headers.get('X-GitHub-Event')
-        payload = request.get_json()
+        try:
+            payload = json.loads(body) if request.is_json else None
+        except ValueError:
+            payload = None
         
         if not payload:
             return jsonify({"error": "Invalid payload"}), 400
         
         logger.info(f"Received {event_type} event")
         
-        # Process different event types
-        if event_type == "issues":
-            issue_bot.process_issue(payload)
-            return jsonify({"message": "Issue processed successfully"}), 200
-        
-        elif event_type == "pull_request":
-            issue_bot.process_pull_request(payload)
-            return jsonify({"message": "Pull request processed successfully"}), 200
+        # Queue issue and PR events for the background worker
+        if event_type in _WEBHOOK_HANDLERS:
+            delivery_id = request.headers.get('X-GitHub-Delivery')
+            if _seen_delivery(delivery_id):
+                return jsonify({"message": "Duplicate delivery ignored"}), 200
+            try:
+                _webhook_queue.put_nowait((event_type, payload))
+            except queue.Full:
+                # Forget the delivery so GitHub's retry is accepted
+                with _recent_deliveries_lock:
+                    _recent_deliveries.pop(delivery_id, None)
+                logger.warning(f"Webhook queue full, rejecting {event_type} event")
+                return jsonify({"error": "Server busy, retry later"}), 503
+            return jsonify({"message": f"Event {event_type} queued for processing"}), 202
         
         elif event_type == "ping":
             return jsonify({"message": "Webhook is working!"}), 200
@@ -144,10 +355,13 @@ def health():
     """Get repository health information"""
     try:
         repo_name = request.args.get('repo', Config.DEFAULT_REPO)
-        analyzer = RepositoryAnalyzer(repo_name)
+        analyzer = _LazyAnalyzer(repo_name)
         
-        health_score = analyzer.calculate_health_score()
-        basic_stats = analyzer.get_basic_stats()
+        # The report already carries the health score and basic stats, and shares
+        # its cache entry with /analytics, so one fetch serves both endpoints
+        report = cached_call(repo_name, 'get_comprehensive_report',
+                             lambda: analyzer().get_comprehensive_report())
+        health_score = report["health_score"]
         
         # Determine health status
         if health_score >= 90:
@@ -163,8 +377,8 @@ def health():
             "repository": repo_name,
             "health_score": health_score,
             "status": status,
-            "basic_stats": basic_stats,
-            "timestamp": analyzer.get_comprehensive_report()["generated_at"]
+            "basic_stats": report["basic_stats"],
+            "timestamp": report["generated_at"]
         })
     
     except Exception as e:
@@ -179,10 +393,12 @@ def analytics(repo_name=None):
         if not repo_name:
             repo_name = request.args.get('repo', Config.DEFAULT_REPO)
         
-        analyzer = RepositoryAnalyzer(repo_name)
-        report = analyzer.get_comprehensive_report()
+        analyzer = _LazyAnalyzer(repo_name)
+        report = dict(cached_call(repo_name, 'get_comprehensive_report',
+                                  lambda: analyzer().get_comprehensive_report()))
         
         # Add additional metadata
+        report['cache'] = analyzer.cache_status()
         report['api_version'] = '1.0'
         report['endpoints'] = {
             'webhook': '/webhook',
@@ -196,6 +412,8 @@ def analytics(repo_name=None):
         logger.error(f"Analytics error: {e}")
         return jsonify({"error": str(e)}), 500
 
+_ANALYZE_ISSUE_FIELDS = frozenset({'repo_name', 'issue_number'})
+
 @app.route("/analyze-issue", methods=["POST"])
 def analyze_issue_manually():
     """Manually analyze and label an issue"""
@@ -204,14 +422,17 @@ def analyze_issue_manually():
         
         if not data:
             return jsonify({"error": "No data provided"}), 400
+        if not isinstance(data, dict):
+            return jsonify({"error": "Expected a JSON object"}), 400
         
-        required_fields = ['repo_name', 'issue_number']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"error": f"Missing required field: {field}"}), 400
+        missing = _ANALYZE_ISSUE_FIELDS - data.keys()
+        if missing:
+            return jsonify({"error": f"Missing required fields: {sorted(missing)}"}), 400
         
         repo_name = data['repo_name']
         issue_number = data['issue_number']
+        if not isinstance(repo_name, str) or not isinstance(issue_number, int) or isinstance(issue_number, bool):
+            return jsonify({"error": "repo_name must be a string and issue_number an integer"}), 400
         
         # Create mock webhook data
         mock_webhook = {
@@ -233,30 +454,42 @@ def analyze_issue_manually():
         logger.error(f"Manual analysis error: {e}")
         return jsonify({"error": str(e)}), 500
 
+def _fetch_repo_stats(repo_name, refresh=False):
+    """Quick statistics for one repository"""
+    analyzer = _LazyAnalyzer(repo_name, refresh)
+    basic_stats = cached_call(repo_name, 'get_basic_stats', lambda: analyzer().get_basic_stats(), refresh)
+    health_score = cached_call(repo_name, 'calculate_health_score',
+                               lambda: analyzer().calculate_health_score(), refresh)
+    
+    return {
+        'health_score': health_score,
+        'stars': basic_stats.get('stars', 0),
+        'forks': basic_stats.get('forks', 0),
+        'open_issues': basic_stats.get('open_issues', 0),
+        'language': basic_stats.get('language', 'Unknown')
+    }
+
 @app.route("/stats", methods=["GET"])
 def quick_stats():
     """Get quick statistics for multiple repositories"""
     try:
-        repos = request.args.get('repos', Config.DEFAULT_REPO).split(',')
-        stats = {}
+        repos = list(dict.fromkeys(
+            repo_name.strip() for repo_name in request.args.get('repos', Config.DEFAULT_REPO).split(',')[:5]
+        ))  # Limit to 5 repos
+        refresh = request.args.get('no_cache') == '1'
+        results = {}
         
-        for repo_name in repos[:5]:  # Limit to 5 repos
-            repo_name = repo_name.strip()
-            try:
-                analyzer = RepositoryAnalyzer(repo_name)
-                basic_stats = analyzer.get_basic_stats()
-                health_score = analyzer.calculate_health_score()
-                
-                stats[repo_name] = {
-                    'health_score': health_score,
-                    'stars': basic_stats.get('stars', 0),
-                    'forks': basic_stats.get('forks', 0),
-                    'open_issues': basic_stats.get('open_issues', 0),
-                    'language': basic_stats.get('language', 'Unknown')
-                }
-            except Exception as e:
-                stats[repo_name] = {'error': str(e)}
+        # Each repository is independent network-bound work, so fetch them in parallel
+        with ThreadPoolExecutor(max_workers=len(repos)) as executor:
+            futures = {executor.submit(_fetch_repo_stats, repo_name, refresh): repo_name
+                       for repo_name in repos}
+            for future in as_completed(futures):
+                try:
+                    results[futures[future]] = future.result()
+                except Exception as e:
+                    results[futures[future]] = {'error': str(e)}
         
+        stats = {repo_name: results[repo_name] for repo_name in repos}
         return jsonify(stats)
     
     except Exception as e:
@@ -279,8 +512,12 @@ if __name__ == "__main__":
     logger.info(f"Health endpoint: http://{Config.FLASK_HOST}:{Config.FLASK_PORT}/health")
     logger.info(f"Analytics endpoint: http://{Config.FLASK_HOST}:{Config.FLASK_PORT}/analytics")
     
-    app.run(
-        host=Config.FLASK_HOST,
-        port=Config.FLASK_PORT,
-        debug=Config.FLASK_DEBUG
-    )
\ No newline at end of file
+    if Config.FLASK_DEV:
+        app.run(
+            host=Config.FLASK_HOST,
+            port=Config.FLASK_PORT,
+            debug=Config.FLASK_DEBUG
+        )
+    else:
+        # Hand over to gunicorn (settings in gunicorn.conf.py)
+        os.execvp(sys.executable, [sys.executable, "-m", "gunicorn", "app:app"])
\ No newline at end of file
@@ -1,10 +1,69 @@
 # Azure Functions configuration for Smart Repository Assistant
 import azure.functions as func
 import logging
+import io
 import json
 import os
+import sys
+from urllib.parse import urlsplit
 from app import app as flask_app
 
+# Error bodies never change, so they are serialized once at import
+_METHOD_NOT_ALLOWED_BODY = json.dumps({"error": "Method not allowed"})
+_INTERNAL_ERROR_BODY = json.dumps({"error": "Internal server error"})
+
+# Static part of the WSGI environ, built once per worker instead of per invocation
+_ENVIRON_TEMPLATE = {
+    'wsgi.version': (1, 0),
+    'wsgi.errors': sys.stderr,
+    'wsgi.multithread': True,
+    'wsgi.multiprocess': False,
+    'wsgi.run_once': False,
+    'SCRIPT_NAME': '',
+    'SERVER_PROTOCOL': 'HTTP/1.1'
+}
+
+def _build_environ(method, path, url, headers, body, content_type=None):
+    """Build a WSGI environ for the Flask app from an Azure Functions request"""
+    parts = urlsplit(url)
+    scheme = parts.scheme or 'https'
+    environ = dict(_ENVIRON_TEMPLATE)
+    environ.update({
+        'wsgi.url_scheme': scheme,
+        'wsgi.input': io.BytesIO(body),
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SERVER_NAME': parts.hostname or 'localhost',
+        'SERVER_PORT': str(parts.port or (443 if scheme == 'https' else 80)),
+        'CONTENT_LENGTH': str(len(body))
+    })
+    for name, value in headers.items():
+        key = name.upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[f'HTTP_{key}'] = value
+        elif key == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+    if content_type:
+        environ['CONTENT_TYPE'] = content_type
+    return environ
+
+def _call_wsgi(environ):
+    """Run the Flask WSGI app directly and return (status code, headers, body)"""
+    captured = {}
+    
+    def start_response(status, response_headers, exc_info=None):
+        captured['status'] = int(status.split(' ', 1)[0])
+        captured['headers'] = dict(response_headers)
+    
+    body_iter = flask_app.wsgi_app(environ, start_response)
+    try:
+        body = b''.join(body_iter)
+    finally:
+        if hasattr(body_iter, 'close'):
+            body_iter.close()
+    return captured['status'], captured['headers'], body
+
 def main(req: func.HttpRequest) -> func.HttpResponse:
     """
     Azure Functions entry point for webhook handling
@@ -18,36 +77,31 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         method = req.method
         url = req.url
         
-        # Create Flask test client
-        with flask_app.test_client() as client:
-            # Forward request to Flask app
-            if method == 'POST':
-                response = client.post(
-                    '/webhook',
-                    data=body,
-                    headers=headers,
-                    content_type='application/json'
-                )
-            elif method == 'GET':
-                response = client.get('/health')
-            else:
-                return func.HttpResponse(
-                    json.dumps({"error": "Method not allowed"}),
-                    status_code=405,
-                    headers={"Content-Type": "application/json"}
-                )
-            
-            # Return response
+        # Forward request straight to the Flask WSGI app
+        if method == 'POST':
+            environ = _build_environ('POST', '/webhook', url, headers, body, 'application/json')
+        elif method == 'GET':
+            environ = _build_environ('GET', '/health', url, {}, b'')
+        else:
             return func.HttpResponse(
-                response.get_data(as_text=True),
-                status_code=response.status_code,
-                headers=dict(response.headers)
+                _METHOD_NOT_ALLOWED_BODY,
+                status_code=405,
+                headers={"Content-Type": "application/json"}
             )
+        
+        status_code, response_headers, response_body = _call_wsgi(environ)
+        
+        # Return response
+        return func.HttpResponse(
+            response_body,
+            status_code=status_code,
+            headers=response_headers
+        )
             
     except Exception as e:
         logging.error(f"❌ Error processing webhook: {str(e)}")
         return func.HttpResponse(
-            json.dumps({"error": "Internal server error"}),
+            _INTERNAL_ERROR_BODY,
             status_code=500,
             headers={"Content-Type": "application/json"}
         )
\ No newline at end of file
@@ -1,17 +1,24 @@
 # Azure Application Insights integration
+import json
 import logging
 import os
-from datetime import datetime
+import threading
+import time
+from datetime import datetime, timezone
 from flask import request
 
 try:
-    from opencensus.ext.azure.log_exporter import AzureLogHandler
-    from opencensus.ext.azure.trace_exporter import AzureExporter
-    from opencensus.ext.flask.flask_middleware import FlaskMiddleware
-    from opencensus.trace.samplers import ProbabilitySampler
-    AZURE_INSIGHTS_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    AZURE_INSIGHTS_AVAILABLE = False
+    ORJSON_AVAILABLE = False
+
+def _to_json(data):
+    """Serialize structured log data as JSON text, with orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        # Datetimes go through ``str`` to match the stdlib fallback's output
+        return orjson.dumps(data, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME).decode('utf-8')
+    return json.dumps(data, default=str, ensure_ascii=False, separators=(',', ':'))
 
 class AzureMonitoring:
     """Azure Application Insights integration for monitoring and telemetry"""
@@ -20,6 +27,7 @@ class AzureMonitoring:
         self.app = app
         self.instrumentation_key = os.getenv('APPINSIGHTS_INSTRUMENTATIONKEY')
         self.connection_string = os.getenv('APPLICATIONINSIGHTS_CONNECTION_STRING')
+        self.enabled = False
         
         if app:
             self.init_app(app)
@@ -30,7 +38,13 @@ class AzureMonitoring:
             app.logger.warning("⚠️  Azure Application Insights not configured")
             return
         
-        if not AZURE_INSIGHTS_AVAILABLE:
+        # The opencensus stack is heavy, so it is only imported once monitoring is configured
+        try:
+            from opencensus.ext.azure.log_exporter import AzureLogHandler
+            from opencensus.ext.azure.trace_exporter import AzureExporter
+            from opencensus.ext.flask.flask_middleware import FlaskMiddleware
+            from opencensus.trace.samplers import ProbabilitySampler
+        except ImportError:
             app.logger.warning("⚠️  Azure Application Insights SDK not installed")
             return
         
@@ -59,6 +73,7 @@ class AzureMonitoring:
                 sampler=ProbabilitySampler(rate=1.0)
             )
             
+            self.enabled = True
             app.logger.info("✅ Azure Application Insights configured successfully")
             
         except Exception as e:
@@ -66,6 +81,8 @@ class AzureMonitoring:
     
     def log_custom_event(self, event_name, properties=None, measurements=None):
         """Log custom event to Application Insights"""
+        if not logging.getLogger().isEnabledFor(logging.INFO):
+            return
         try:
             # This would typically use the Application Insights SDK
             # For now, we'll use structured logging
@@ -74,12 +91,14 @@ class AzureMonitoring:
                 'properties': properties or {},
                 'measurements': measurements or {}
             }
-            logging.info(f"📊 Custom Event: {event_data}")
+            logging.info("📊 Custom Event: %s", _to_json(event_data))
         except Exception as e:
             logging.error(f"❌ Failed to log custom event: {str(e)}")
     
     def log_dependency(self, name, command_name, start_time, duration, success):
         """Log dependency call to Application Insights"""
+        if not logging.getLogger().isEnabledFor(logging.INFO):
+            return
         try:
             dependency_data = {
                 'dependency': name,
@@ -88,17 +107,26 @@ class AzureMonitoring:
                 'success': success,
                 'start_time': start_time
             }
-            logging.info(f"🔗 Dependency: {dependency_data}")
+            logging.info("🔗 Dependency: %s", _to_json(dependency_data))
         except Exception as e:
             logging.error(f"❌ Failed to log dependency: {str(e)}")
 
+# Probe and landing-page paths are too frequent and uninteresting to log per request
+UNTRACKED_PATHS = ('/', '/health')
+
 def configure_azure_monitoring(app):
     """Configure Azure monitoring for the Flask application"""
     monitoring = AzureMonitoring(app)
     
+    # Without Application Insights there is nowhere to send request telemetry
+    if not monitoring.enabled:
+        return monitoring
+    
     # Add custom properties to all telemetry
     @app.before_request
     def before_request():
+        if request.path in UNTRACKED_PATHS:
+            return
         # Add request context
         monitoring.log_custom_event('request_started', {
             'method': request.method,
@@ -109,6 +137,8 @@ def configure_azure_monitoring(app):
     
     @app.after_request
     def after_request(response):
+        if request.path in UNTRACKED_PATHS:
+            return response
         # Log response
         monitoring.log_custom_event('request_completed', {
             'status_code': response.status_code,
@@ -118,32 +148,51 @@ def configure_azure_monitoring(app):
     
     return monitoring
 
-# Health check endpoint for Azure
-def azure_health_check():
-    """Azure-specific health check with detailed diagnostics"""
-    health_data = {
-        'status': 'healthy',
-        'timestamp': datetime.utcnow().isoformat(),
-        'version': '1.0.0',
-        'environment': os.getenv('ENVIRONMENT', 'development'),
-        'azure_region': os.getenv('WEBSITE_SITE_NAME', 'unknown'),
-        'checks': {}
-    }
+# Successful GitHub connectivity checks are reused for this many seconds, so
+# frequent Azure probes don't each spend an unauthenticated API request
+GITHUB_CHECK_TTL = 30
+_github_check = None  # (monotonic time, check result)
+_github_check_lock = threading.Lock()
+
+def _check_github_api():
+    """GitHub connectivity check, cached while it keeps succeeding"""
+    global _github_check
+    with _github_check_lock:
+        if _github_check and time.monotonic() - _github_check[0] < GITHUB_CHECK_TTL:
+            return dict(_github_check[1])
     
     try:
-        # Check GitHub connectivity
         import requests
         response = requests.get('https://api.github.com/rate_limit', timeout=5)
-        health_data['checks']['github_api'] = {
+        check = {
             'status': 'healthy' if response.status_code == 200 else 'unhealthy',
             'response_time_ms': int(response.elapsed.total_seconds() * 1000)
         }
     except Exception as e:
-        health_data['checks']['github_api'] = {
+        check = {
             'status': 'unhealthy',
             'error': str(e)
         }
     
+    with _github_check_lock:
+        _github_check = (time.monotonic(), check) if check['status'] == 'healthy' else None
+    return dict(check)
+
+# Health check endpoint for Azure
+def azure_health_check():
+    """Azure-specific health check with detailed diagnostics"""
+    health_data = {
+        'status': 'healthy',
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'version': '1.0.0',
+        'environment': os.getenv('ENVIRONMENT', 'development'),
+        'azure_region': os.getenv('WEBSITE_SITE_NAME', 'unknown'),
+        'checks': {}
+    }
+    
+    # Check GitHub connectivity
+    health_data['checks']['github_api'] = _check_github_api()
+    
     # Check database/storage connectivity (if applicable)
     health_data['checks']['storage'] = {'status': 'healthy'}
     
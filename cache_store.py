@@ -0,0 +1,188 @@
+"""
+Smart Repository Assistant - Analytics Snapshot Cache
+Local SQLite store of fetched issues, pull requests and commits so repeat
+analyses only pull what changed since the last run, and of issue
+classifications so unchanged issues are not re-analyzed
+"""
+
+import sqlite3
+import json
+import threading
+import time
+from datetime import datetime
+
+# Record kinds and the column each is ordered/delta-synced by
+_TABLES = {
+    'issues': 'updated_at',
+    'pulls': 'updated_at',
+    'commits': 'date'
+}
+
+def _encode(value):
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+def _decode(obj):
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    return obj
+
+class SnapshotStore:
+    """SQLite-backed snapshot of repository records keyed by repo and record id"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            for table, column in _TABLES.items():
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} ("
+                    f"repo TEXT, key TEXT, {column} TEXT, data TEXT, "
+                    f"PRIMARY KEY (repo, key))"
+                )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sync_state ("
+                "repo TEXT, kind TEXT, covered_since TEXT, PRIMARY KEY (repo, kind))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS basic_stats ("
+                "repo TEXT PRIMARY KEY, fetched_at REAL, data TEXT)"
+            )
+    
+    def latest(self, kind, repo):
+        """Newest ordering timestamp stored for ``repo``, or None when nothing is cached"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT MAX({_TABLES[kind]}) FROM {kind} WHERE repo = ?", (repo,)
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row and row[0] else None
+    
+    def load(self, kind, repo, since=None):
+        """Cached records for ``repo``, newest first, optionally only those at/after ``since``"""
+        column = _TABLES[kind]
+        query = f"SELECT data FROM {kind} WHERE repo = ?"
+        params = [repo]
+        if since is not None:
+            query += f" AND {column} >= ?"
+            params.append(since.isoformat())
+        with self._lock:
+            rows = self._conn.execute(f"{query} ORDER BY {column} DESC", params).fetchall()
+        return [json.loads(data, object_hook=_decode) for (data,) in rows]
+    
+    def upsert(self, kind, repo, records, key):
+        """Insert or replace records, identified by their ``key`` field"""
+        column = _TABLES[kind]
+        rows = [
+            (repo, str(record[key]), record[column].isoformat(), json.dumps(record, default=_encode))
+            for record in records
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {kind} (repo, key, {column}, data) VALUES (?, ?, ?, ?)",
+                rows
+            )
+    
+    def covered_since(self, kind, repo):
+        """Earliest point from which cached records of ``kind`` are known to be complete"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT covered_since FROM sync_state WHERE repo = ? AND kind = ?", (repo, kind)
+            ).fetchone()
+        if not row:
+            return None
+        return datetime.fromisoformat(row[0]) if row[0] else datetime.min
+    
+    def set_covered_since(self, kind, repo, since):
+        """Record completeness from ``since`` onwards (None meaning the full history)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (repo, kind, covered_since) VALUES (?, ?, ?)",
+                (repo, kind, since.isoformat() if since else None)
+            )
+    
+    def get_basic_stats(self, repo, max_age):
+        """Cached basic stats for ``repo`` if fetched within ``max_age`` seconds"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fetched_at, data FROM basic_stats WHERE repo = ?", (repo,)
+            ).fetchone()
+        if row and time.time() - row[0] < max_age:
+            return json.loads(row[1], object_hook=_decode)
+        return None
+    
+    def set_basic_stats(self, repo, stats):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO basic_stats (repo, fetched_at, data) VALUES (?, ?, ?)",
+                (repo, time.time(), json.dumps(stats, default=_encode))
+            )
+    
+    def clear_basic_stats(self, repo):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM basic_stats WHERE repo = ?", (repo,))
+    
+    def clear(self, repo=None):
+        """Forget cached records for one repository, or for all of them"""
+        with self._lock, self._conn:
+            for table in [*_TABLES, 'sync_state', 'basic_stats']:
+                if repo is None:
+                    self._conn.execute(f"DELETE FROM {table}")
+                else:
+                    self._conn.execute(f"DELETE FROM {table} WHERE repo = ?", (repo,))
+
+class ClassificationStore:
+    """SQLite-backed issue classifications keyed by a digest of the classified text"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cls ("
+                "h BLOB PRIMARY KEY, type TEXT, priority TEXT, sentiment TEXT, components TEXT)"
+            )
+    
+    def get(self, digest):
+        """Cached (type, priority, sentiment, components), or None when not classified yet"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT type, priority, sentiment, components FROM cls WHERE h = ?", (digest,)
+            ).fetchone()
+        if not row:
+            return None
+        return row[0], row[1], row[2], json.loads(row[3])
+    
+    def put(self, digest, issue_type, priority, sentiment, components):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cls (h, type, priority, sentiment, components) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (digest, issue_type, priority, sentiment, json.dumps(components))
+            )
+    
+    def clear(self):
+        """Forget every cached classification"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM cls")
+
+# Stores are shared per database path so concurrent analyzers reuse one connection
+_stores = {}
+_stores_lock = threading.Lock()
+
+def _get_store(cls, path):
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = cls(path)
+        return store
+
+def get_snapshot_store(path):
+    """Return the shared snapshot store for ``path``"""
+    return _get_store(SnapshotStore, path)
+
+def get_classification_store(path):
+    """Return the shared classification store for ``path``"""
+    return _get_store(ClassificationStore, path)
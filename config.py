@@ -3,12 +3,17 @@ Configuration settings for Smart Repository Assistant
 """
 import os
 from dotenv import load_dotenv
+from _config_base import _BaseConfig, KeywordMatcher
 
 load_dotenv()
 
-class Config:
+class Config(_BaseConfig):
     # GitHub Configuration
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
+    # Optional comma-separated pool of tokens to spread bulk analytics across
+    GITHUB_TOKENS = [
+        token.strip() for token in os.getenv('GITHUB_TOKENS', '').split(',') if token.strip()
+    ] or ([GITHUB_TOKEN] if GITHUB_TOKEN else [])
     GITHUB_WEBHOOK_SECRET = os.getenv('GITHUB_WEBHOOK_SECRET')
     
     # Repository Configuration
@@ -18,34 +23,16 @@ class Config:
     FLASK_HOST = os.getenv('FLASK_HOST', '0.0.0.0')
     FLASK_PORT = int(os.getenv('FLASK_PORT', 5000))
     FLASK_DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    # Use Flask's development server instead of gunicorn
+    FLASK_DEV = os.getenv('FLASK_DEV') == '1'
+    # Seconds an issue/PR must go without new events before its latest one is processed
+    WEBHOOK_DEBOUNCE_SECONDS = float(os.getenv('WEBHOOK_DEBOUNCE_SECONDS', 5))
     
     # Analytics Configuration
     ANALYTICS_UPDATE_INTERVAL = int(os.getenv('ANALYTICS_UPDATE_INTERVAL', 3600))  # 1 hour
-    
-    # Issue Classification Labels
-    ISSUE_LABELS = {
-        'bug': ['bug', 'error', 'crash', 'broken', 'not working', 'fail'],
-        'feature': ['feature', 'enhancement', 'new', 'add', 'implement'],
-        'documentation': ['doc', 'documentation', 'readme', 'guide', 'help'],
-        'question': ['question', 'help', 'how to', 'support'],
-        'performance': ['performance', 'slow', 'optimization', 'speed'],
-        'security': ['security', 'vulnerability', 'auth', 'permission'],
-        'maintenance': ['maintenance', 'cleanup', 'refactor', 'update'],
-        'ci/cd': ['ci', 'cd', 'build', 'deploy', 'pipeline', 'test']
-    }
-    
-    # Priority Labels
-    PRIORITY_KEYWORDS = {
-        'critical': ['critical', 'urgent', 'emergency', 'blocking'],
-        'high': ['high', 'important', 'asap'],
-        'medium': ['medium', 'normal'],
-        'low': ['low', 'minor', 'nice to have']
-    }
-    
-    # Repository Health Thresholds
-    HEALTH_THRESHOLDS = {
-        'excellent': 90,
-        'good': 75,
-        'fair': 60,
-        'poor': 40
-    }
\ No newline at end of file
+    # Local SQLite snapshot so repeat analyses only fetch what changed
+    ANALYTICS_CACHE_ENABLED = os.getenv('ANALYTICS_CACHE_ENABLED', 'True').lower() == 'true'
+    ANALYTICS_CACHE_PATH = os.getenv('ANALYTICS_CACHE_PATH', 'analytics_cache.db')
+    # Issue classifications keyed by title/body, so trivial edits skip re-analysis
+    CLASSIFIER_CACHE_ENABLED = os.getenv('CLASSIFIER_CACHE_ENABLED', 'True').lower() == 'true'
+    CLASSIFIER_CACHE_PATH = os.getenv('CLASSIFIER_CACHE_PATH', 'classifier_cache.db')
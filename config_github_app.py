@@ -5,14 +5,20 @@ Enhanced configuration supporting both Personal Access Tokens and GitHub Apps
 
 import os
 from dotenv import load_dotenv
+from _config_base import _BaseConfig
 
 load_dotenv()
 
-class Config:
+class Config(_BaseConfig):
     # GitHub App Configuration (Recommended for production)
     GITHUB_APP_ID = os.getenv('GITHUB_APP_ID')
     GITHUB_APP_PRIVATE_KEY_PATH = os.getenv('GITHUB_APP_PRIVATE_KEY_PATH', 'private-key.pem')
     GITHUB_APP_INSTALLATION_ID = os.getenv('GITHUB_APP_INSTALLATION_ID')
+    # Where the installation token is kept between restarts; set empty to disable
+    GITHUB_APP_TOKEN_CACHE_PATH = os.getenv(
+        'GITHUB_APP_TOKEN_CACHE_PATH',
+        os.path.join(os.path.expanduser('~'), '.cache', 'repo-assistant', 'installation_token.json')
+    )
     
     # Personal Access Token (For development/testing)
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
@@ -34,34 +40,6 @@ class Config:
     # Deployment Configuration
     ENVIRONMENT = os.getenv('ENVIRONMENT', 'development')  # development, production
     
-    # Issue Classification Labels
-    ISSUE_LABELS = {
-        'bug': ['bug', 'error', 'crash', 'broken', 'not working', 'fail'],
-        'feature': ['feature', 'enhancement', 'new', 'add', 'implement'],
-        'documentation': ['doc', 'documentation', 'readme', 'guide', 'help'],
-        'question': ['question', 'help', 'how to', 'support'],
-        'performance': ['performance', 'slow', 'optimization', 'speed'],
-        'security': ['security', 'vulnerability', 'auth', 'permission'],
-        'maintenance': ['maintenance', 'cleanup', 'refactor', 'update'],
-        'ci/cd': ['ci', 'cd', 'build', 'deploy', 'pipeline', 'test']
-    }
-    
-    # Priority Labels
-    PRIORITY_KEYWORDS = {
-        'critical': ['critical', 'urgent', 'emergency', 'blocking'],
-        'high': ['high', 'important', 'asap'],
-        'medium': ['medium', 'normal'],
-        'low': ['low', 'minor', 'nice to have']
-    }
-    
-    # Repository Health Thresholds
-    HEALTH_THRESHOLDS = {
-        'excellent': 90,
-        'good': 75,
-        'fair': 60,
-        'poor': 40
-    }
-    
     @classmethod
     def is_github_app_configured(cls):
         """Check if GitHub App configuration is available"""
@@ -4,15 +4,19 @@ Comprehensive visualization and monitoring interface
 """
 
 import streamlit as st
-import plotly.express as px
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+import pyarrow as pa
 from datetime import datetime, timedelta
 import json
+import time
 from analytics import RepositoryAnalyzer
 from config import Config
+from dashboard_components import (
+    MAX_CHART_POINTS, STABLE_LAYOUT, WEBGL_CONFIG, cached_figure, downsample_lttb, fragment,
+    issue_arrays, display_advanced_metrics, create_comparison_dashboard, create_real_time_monitoring
+)
 
 # Configure Streamlit page
 st.set_page_config(
@@ -39,11 +43,26 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def load_analytics_data(repo_name):
-    """Load analytics data with caching"""
+# Seconds between live metric updates while auto-refresh is on
+AUTO_REFRESH_INTERVAL = 300
+
+def _refresh_bucket(auto_refresh):
+    """Cache key part that rolls over every refresh interval while auto-refresh is on"""
+    return int(time.time() // AUTO_REFRESH_INTERVAL) if auto_refresh else 0
+
+@st.cache_resource(show_spinner=False)
+def get_analyzer(repo_name):
+    """Shared analyzer per repository, so its GitHub clients and sessions survive reruns"""
+    return RepositoryAnalyzer(repo_name)
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+def load_analytics_data(repo_name, refresh_bucket=0):
+    """Load analytics data with caching; a new ``refresh_bucket`` forces a fresh fetch"""
     try:
-        analyzer = RepositoryAnalyzer(repo_name)
+        analyzer = get_analyzer(repo_name)
+        if analyzer.cache:
+            # Reused analyzer: drop its memoized sections, this load should be fresh
+            analyzer.invalidate()
         return analyzer.get_comprehensive_report()
     except Exception as e:
         st.error(f"Error loading data: {e}")
@@ -72,6 +91,7 @@ def display_health_score(score):
     </div>
     """, unsafe_allow_html=True)
 
+@cached_figure
 def create_commit_activity_chart(commit_data):
     """Create commit activity visualization"""
     if not commit_data or 'daily_commits' not in commit_data:
@@ -81,107 +101,136 @@ def create_commit_activity_chart(commit_data):
     if not daily_commits:
         return None
     
-    dates = list(daily_commits.keys())
-    counts = list(daily_commits.values())
+    # Plotly converts trace data to arrays anyway, so build them directly
+    dates = np.array(list(daily_commits))
+    counts = np.fromiter(daily_commits.values(), dtype=np.int32, count=len(daily_commits))
+    
+    if len(dates) > MAX_CHART_POINTS:
+        # Thin long histories in date order, keeping visually significant points
+        order = np.argsort(dates)
+        dates, counts = dates[order], counts[order]
+        keep = downsample_lttb(dates.astype('datetime64[D]').astype(np.int64), counts)
+        dates, counts = dates[keep], counts[keep]
     
-    fig = go.Figure()
-    fig.add_trace(go.Scatter(
+    fig = go.Figure(data=[go.Scattergl(
         x=dates,
         y=counts,
         mode='lines+markers',
         name='Daily Commits',
         line=dict(color='#1f77b4', width=2),
         marker=dict(size=6)
-    ))
-    
-    fig.update_layout(
+    )], layout=go.Layout(
         title="Commit Activity (Last 30 Days)",
         xaxis_title="Date",
         yaxis_title="Number of Commits",
-        hovermode='x unified'
-    )
+        hovermode='x unified',
+        **STABLE_LAYOUT
+    ))
     
-    return fig
+    return fig.to_dict()
 
+@cached_figure
 def create_issue_analytics_charts(issue_data):
-    """Create issue analytics visualizations"""
-    charts = []
+    """Create issue analytics visualizations as one figure, one panel per available section"""
+    if not issue_data:
+        return None
+    
+    arrays = issue_arrays(issue_data)
+    traces = []
     
-    if issue_data and 'label_distribution' in issue_data:
+    if arrays.labels is not None:
         # Label distribution pie chart
-        labels = list(issue_data['label_distribution'].keys())
-        values = list(issue_data['label_distribution'].values())
-        
-        fig_pie = go.Figure(data=[go.Pie(
-            labels=labels,
-            values=values,
+        traces.append(("Issue Label Distribution", "domain", [go.Pie(
+            labels=arrays.labels,
+            values=arrays.label_counts,
             hole=0.3
-        )])
-        fig_pie.update_layout(title="Issue Label Distribution")
-        charts.append(("Label Distribution", fig_pie))
+        )]))
     
-    if issue_data and 'issues_by_month' in issue_data:
+    if arrays.months is not None:
         # Monthly issue trends
-        monthly_data = issue_data['issues_by_month']
-        months = sorted(monthly_data.keys())
-        opened = [monthly_data[month]['opened'] for month in months]
-        closed = [monthly_data[month]['closed'] for month in months]
-        
-        fig_monthly = go.Figure()
-        fig_monthly.add_trace(go.Bar(x=months, y=opened, name='Opened', marker_color='#ff6b6b'))
-        fig_monthly.add_trace(go.Bar(x=months, y=closed, name='Closed', marker_color='#4ecdc4'))
-        
-        fig_monthly.update_layout(
-            title="Monthly Issue Trends",
-            xaxis_title="Month",
-            yaxis_title="Number of Issues",
-            barmode='group'
-        )
-        charts.append(("Monthly Trends", fig_monthly))
+        traces.append(("Monthly Issue Trends", "xy", [
+            go.Bar(x=arrays.months, y=arrays.opened, name='Opened', marker_color='#ff6b6b'),
+            go.Bar(x=arrays.months, y=arrays.closed, name='Closed', marker_color='#4ecdc4')
+        ]))
+    
+    if not traces:
+        return None
     
-    return charts
+    # Subplot support is only loaded once a chart actually needs it
+    from plotly.subplots import make_subplots
+    
+    # A single figure renders both panels in one chart element and layout pass
+    fig = make_subplots(
+        rows=1, cols=len(traces),
+        specs=[[{"type": panel_type} for _, panel_type, _ in traces]],
+        subplot_titles=[title for title, _, _ in traces]
+    )
+    for col, (_, panel_type, panel_traces) in enumerate(traces, start=1):
+        for trace in panel_traces:
+            fig.add_trace(trace, row=1, col=col)
+        if panel_type == "xy":
+            fig.update_xaxes(title_text="Month", row=1, col=col)
+            fig.update_yaxes(title_text="Number of Issues", row=1, col=col)
+    
+    fig.update_layout(barmode='group', **STABLE_LAYOUT)
+    return fig.to_dict()
+
+def _contributor_arrays(contributor_data):
+    """Contributor names with their commit, issue and PR counts as parallel arrays"""
+    names = np.array(list(contributor_data))
+    stats = list(contributor_data.values())
+    commits = np.fromiter((s.get('commits', 0) for s in stats), dtype=np.int32, count=len(stats))
+    issues = np.fromiter((s.get('issues_opened', 0) for s in stats), dtype=np.int32, count=len(stats))
+    prs = np.fromiter((s.get('prs_opened', 0) for s in stats), dtype=np.int32, count=len(stats))
+    return names, commits, issues, prs
 
+@cached_figure
 def create_contributor_chart(contributor_data):
     """Create contributor activity visualization"""
     if not contributor_data:
         return None
     
-    # Prepare data
-    contributors = []
-    commits = []
-    issues = []
-    prs = []
-    
-    for name, stats in list(contributor_data.items())[:10]:  # Top 10 contributors
-        contributors.append(name)
-        commits.append(stats['commits'])
-        issues.append(stats['issues_opened'])
-        prs.append(stats['prs_opened'])
+    # Prepare data: the ten contributors with the most commits, most first
+    names, commits, issues, prs = _contributor_arrays(contributor_data)
+    top = np.sort(np.argpartition(-commits, min(10, len(commits)) - 1)[:10])
+    top = top[np.argsort(-commits[top], kind='stable')]  # Ties keep report order
     
     # Create subplot
+    from plotly.subplots import make_subplots
     fig = make_subplots(
         rows=1, cols=3,
         subplot_titles=('Commits', 'Issues Opened', 'PRs Opened'),
         specs=[[{"type": "bar"}, {"type": "bar"}, {"type": "bar"}]]
     )
     
-    fig.add_trace(go.Bar(x=contributors, y=commits, name="Commits"), row=1, col=1)
-    fig.add_trace(go.Bar(x=contributors, y=issues, name="Issues"), row=1, col=2)
-    fig.add_trace(go.Bar(x=contributors, y=prs, name="PRs"), row=1, col=3)
+    contributors = names[top]
+    fig.add_trace(go.Bar(x=contributors, y=commits[top], name="Commits"), row=1, col=1)
+    fig.add_trace(go.Bar(x=contributors, y=issues[top], name="Issues"), row=1, col=2)
+    fig.add_trace(go.Bar(x=contributors, y=prs[top], name="PRs"), row=1, col=3)
     
+    # make_subplots owns the layout, so set everything in one pass; rotate x-axis labels
     fig.update_layout(
         title_text="Top Contributors Activity",
         showlegend=False,
-        height=400
+        height=400,
+        uirevision='contributors',  # Keep zoom/pan across reruns instead of re-laying out
+        transition={'duration': 0},
+        xaxis_tickangle=45,
+        xaxis2_tickangle=45,
+        xaxis3_tickangle=45
     )
     
-    # Rotate x-axis labels
-    fig.update_xaxes(tickangle=45)
-    
-    return fig
+    return fig.to_dict()
+
+def display_live_metrics(repo_name, auto_refresh):
+    """Key metrics from the cached report, re-read on each auto-refresh tick"""
+    data = load_analytics_data(repo_name, _refresh_bucket(auto_refresh))
+    if data:
+        display_key_metrics(data)
 
 def display_key_metrics(data):
     """Display key metrics in columns"""
+    # Read straight from the report: hashing it for a cache would cost far more
     basic_stats = data.get('basic_stats', {})
     issue_analytics = data.get('issue_analytics', {})
     pr_analytics = data.get('pr_analytics', {})
@@ -230,6 +279,107 @@ def display_key_metrics(data):
             basic_stats.get('forks', 0)
         )
 
+@fragment
+def display_analytics_charts(data):
+    """Render the main analytics charts; reruns on its own as a fragment"""
+    # Commit activity
+    commit_fig = create_commit_activity_chart(data.get('commit_activity'))
+    if commit_fig:
+        st.plotly_chart(commit_fig, use_container_width=True, config=WEBGL_CONFIG)
+    
+    # Issue analytics
+    issue_fig = create_issue_analytics_charts(data.get('issue_analytics'))
+    if issue_fig:
+        st.plotly_chart(issue_fig, use_container_width=True)
+    
+    # Contributor activity
+    contributor_fig = create_contributor_chart(data.get('contributor_activity'))
+    if contributor_fig:
+        st.plotly_chart(contributor_fig, use_container_width=True)
+
+def _markdown_table(rows, header=("Metric", "Value"), title=None):
+    """Two-column Markdown table for a flat dict, rendered as a single text element"""
+    lines = [f"### {title}", ""] if title else []
+    lines += [f"| {header[0]} | {header[1]} |", "|---|---|"]
+    lines.extend(f"| {str(key).replace('|', '&#124;')} | {value} |" for key, value in rows.items())
+    return "\n".join(lines)
+
+@fragment
+def display_data_tables(data):
+    """Render the detailed data tables; reruns on its own as a fragment"""
+    tab1, tab2, tab3, tab4 = st.tabs(["📝 Recent Commits", "🐛 Issue Analytics", "🔀 PR Analytics", "👥 Contributors"])
+    
+    with tab1:
+        commit_activity = data.get('commit_activity', {})
+        if 'commit_details' in commit_activity:
+            df_commits = pd.DataFrame(commit_activity['commit_details'])
+            st.dataframe(df_commits, use_container_width=True)
+        else:
+            st.info("No recent commit data available")
+    
+    with tab2:
+        issue_analytics = data.get('issue_analytics', {})
+        if issue_analytics:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown(_markdown_table({
+                    "Total Issues": issue_analytics.get('total_issues', 0),
+                    "Open Issues": issue_analytics.get('open_issues', 0),
+                    "Close Rate": f"{issue_analytics.get('close_rate', 0):.1f}%",
+                    "Avg Response Time": f"{issue_analytics.get('avg_response_time_hours', 0):.1f} hours"
+                }, title="📊 Summary Metrics"))
+            
+            with col2:
+                if 'label_distribution' in issue_analytics:
+                    st.markdown(_markdown_table(issue_analytics['label_distribution'], ("Label", "Issues"),
+                                                title="🏷️ Label Distribution"))
+                else:
+                    st.markdown("### 🏷️ Label Distribution")
+        else:
+            st.info("No issue analytics available")
+    
+    with tab3:
+        pr_analytics = data.get('pr_analytics', {})
+        if pr_analytics:
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown(_markdown_table({
+                    "Total PRs": pr_analytics.get('total_prs', 0),
+                    "Open PRs": pr_analytics.get('open_prs', 0),
+                    "Merged PRs": pr_analytics.get('merged_prs', 0),
+                    "Merge Rate": f"{pr_analytics.get('merge_rate', 0):.1f}%"
+                }, title="📊 PR Metrics"))
+            
+            with col2:
+                if 'pr_size_distribution' in pr_analytics:
+                    st.markdown(_markdown_table(pr_analytics['pr_size_distribution'], ("Size", "PRs"),
+                                                title="📏 Size Distribution"))
+                else:
+                    st.markdown("### 📏 Size Distribution")
+        else:
+            st.info("No PR analytics available")
+    
+    with tab4:
+        contributor_activity = data.get('contributor_activity', {})
+        if contributor_activity:
+            # Create a more readable contributor table as an Arrow table, which
+            # st.dataframe sends to the browser without a pandas conversion
+            names = list(contributor_activity)
+            stats = [contributor_activity[name] for name in names]
+            columns = {'Contributor': np.array(names, dtype=object)}
+            for column, key in (('Commits', 'commits'), ('Issues', 'issues_opened'),
+                                ('PRs', 'prs_opened'), ('Reviews', 'prs_reviewed'),
+                                ('Comments', 'issues_commented'), ('Lines Added', 'lines_added'),
+                                ('Lines Deleted', 'lines_deleted')):
+                columns[column] = np.fromiter((s.get(key, 0) for s in stats), dtype=np.int64, count=len(stats))
+            order = np.argsort(-columns['Commits'], kind='stable')
+            table_contributors = pa.table({column: values[order] for column, values in columns.items()})
+            st.dataframe(table_contributors, use_container_width=True)
+        else:
+            st.info("No contributor data available")
+
 def main():
     """Main dashboard function"""
     st.title("🤖 Smart Repository Assistant")
@@ -245,7 +395,10 @@ def main():
     
     auto_refresh = st.sidebar.checkbox("Auto-refresh (every 5 minutes)", value=False)
     
-    if st.sidebar.button("🔄 Refresh Data") or auto_refresh:
+    # Only the live metric fragments rerun on the timer; charts stay cached between ticks
+    refresh_every = AUTO_REFRESH_INTERVAL if auto_refresh else None
+    
+    if st.sidebar.button("🔄 Refresh Data"):
         st.cache_data.clear()
     
     # Export options
@@ -254,7 +407,7 @@ def main():
     
     # Load data
     with st.spinner("Loading repository data..."):
-        data = load_analytics_data(repo_name)
+        data = load_analytics_data(repo_name, _refresh_bucket(auto_refresh))
     
     if not data:
         st.error("Failed to load repository data. Please check your configuration.")
@@ -263,7 +416,7 @@ def main():
     # Export functionality
     if st.sidebar.button("📊 Export JSON Report"):
         try:
-            analyzer = RepositoryAnalyzer(repo_name)
+            analyzer = get_analyzer(repo_name)
             filename = analyzer.export_to_json()
             st.sidebar.success(f"Report exported to {filename}")
         except Exception as e:
@@ -292,44 +445,23 @@ def main():
     # Key metrics
     st.markdown("---")
     st.header("📈 Key Metrics")
-    display_key_metrics(data)
+    fragment(run_every=refresh_every)(display_live_metrics)(repo_name, auto_refresh)
     
     # Charts section
     st.markdown("---")
     st.header("📊 Analytics Charts")
     
-    # Commit activity
-    commit_fig = create_commit_activity_chart(data.get('commit_activity'))
-    if commit_fig:
-        st.plotly_chart(commit_fig, use_container_width=True)
-    
-    # Issue analytics
-    col1, col2 = st.columns(2)
-    
-    issue_charts = create_issue_analytics_charts(data.get('issue_analytics'))
-    for i, (title, chart) in enumerate(issue_charts):
-        if i % 2 == 0:
-            with col1:
-                st.plotly_chart(chart, use_container_width=True)
-        else:
-            with col2:
-                st.plotly_chart(chart, use_container_width=True)
-    
-    # Contributor activity
-    contributor_fig = create_contributor_chart(data.get('contributor_activity'))
-    if contributor_fig:
-        st.plotly_chart(contributor_fig, use_container_width=True)
+    display_analytics_charts(data)
     
     # Advanced Analytics Section
     st.markdown("---")
-    from dashboard_components import display_advanced_metrics, create_comparison_dashboard, create_real_time_monitoring
     
     # Display advanced metrics with beautiful visualizations
     display_advanced_metrics(data)
     
     # Real-time monitoring
     st.markdown("---")
-    create_real_time_monitoring()
+    fragment(run_every=refresh_every)(create_real_time_monitoring)()
     
     # Repository comparison
     st.markdown("---")
@@ -339,88 +471,11 @@ def main():
     st.markdown("---")
     st.header("📋 Detailed Data Tables")
     
-    tab1, tab2, tab3, tab4 = st.tabs(["📝 Recent Commits", "🐛 Issue Analytics", "🔀 PR Analytics", "👥 Contributors"])
-    
-    with tab1:
-        commit_activity = data.get('commit_activity', {})
-        if 'commit_details' in commit_activity:
-            df_commits = pd.DataFrame(commit_activity['commit_details'])
-            st.dataframe(df_commits, use_container_width=True)
-        else:
-            st.info("No recent commit data available")
-    
-    with tab2:
-        issue_analytics = data.get('issue_analytics', {})
-        if issue_analytics:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### 📊 Summary Metrics")
-                st.json({
-                    "Total Issues": issue_analytics.get('total_issues', 0),
-                    "Open Issues": issue_analytics.get('open_issues', 0),
-                    "Close Rate": f"{issue_analytics.get('close_rate', 0):.1f}%",
-                    "Avg Response Time": f"{issue_analytics.get('avg_response_time_hours', 0):.1f} hours"
-                })
-            
-            with col2:
-                st.markdown("### 🏷️ Label Distribution")
-                if 'label_distribution' in issue_analytics:
-                    st.json(issue_analytics['label_distribution'])
-        else:
-            st.info("No issue analytics available")
-    
-    with tab3:
-        pr_analytics = data.get('pr_analytics', {})
-        if pr_analytics:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown("### 📊 PR Metrics")
-                st.json({
-                    "Total PRs": pr_analytics.get('total_prs', 0),
-                    "Open PRs": pr_analytics.get('open_prs', 0),
-                    "Merged PRs": pr_analytics.get('merged_prs', 0),
-                    "Merge Rate": f"{pr_analytics.get('merge_rate', 0):.1f}%"
-                })
-            
-            with col2:
-                st.markdown("### 📏 Size Distribution")
-                if 'pr_size_distribution' in pr_analytics:
-                    st.json(pr_analytics['pr_size_distribution'])
-        else:
-            st.info("No PR analytics available")
-    
-    with tab4:
-        contributor_activity = data.get('contributor_activity', {})
-        if contributor_activity:
-            # Create a more readable contributor table
-            contributor_list = []
-            for name, stats in contributor_activity.items():
-                contributor_list.append({
-                    'Contributor': name,
-                    'Commits': stats.get('commits', 0),
-                    'Issues': stats.get('issues_opened', 0),
-                    'PRs': stats.get('prs_opened', 0),
-                    'Reviews': stats.get('prs_reviewed', 0),
-                    'Comments': stats.get('issues_commented', 0),
-                    'Lines Added': stats.get('lines_added', 0),
-                    'Lines Deleted': stats.get('lines_deleted', 0)
-                })
-            
-            df_contributors = pd.DataFrame(contributor_list)
-            df_contributors = df_contributors.sort_values('Commits', ascending=False)
-            st.dataframe(df_contributors, use_container_width=True)
-        else:
-            st.info("No contributor data available")
+    display_data_tables(data)
     
     # Footer
     st.markdown("---")
     st.markdown("*Data generated at: " + data.get('generated_at', 'Unknown') + "*")
-    
-    # Auto-refresh logic
-    if auto_refresh:
-        st.experimental_rerun()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
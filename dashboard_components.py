@@ -4,36 +4,116 @@ Additional visualization modules for the Smart Repository Assistant
 """
 
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
 import numpy as np
+from collections import namedtuple
 from datetime import datetime, timedelta
+from itertools import islice
+import json
 import streamlit as st
 
+# Time series are drawn as WebGL traces; render them at 1:1 pixel ratio
+WEBGL_CONFIG = {'plotGlPixelRatio': 1}
+
+# Single-value charts have nothing to hover or zoom, so skip Plotly.js's event handlers
+STATIC_CONFIG = {'staticPlot': True, 'displayModeBar': False}
+
+# Layout defaults for every chart: a constant uirevision lets Plotly.js apply a
+# rerender as an update (keeping zoom/pan) and a zero-length transition skips
+# the animation it would otherwise play between the two states
+STABLE_LAYOUT = {'uirevision': 'constant', 'transition': {'duration': 0}}
+
+# Long time series are thinned to this many points before they are sent to the browser
+MAX_CHART_POINTS = 500
+
+def downsample_lttb(x, y, threshold=MAX_CHART_POINTS):
+    """Indices of the points Largest-Triangle-Three-Buckets keeps from an x-sorted series"""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    every = (n - 2) / (threshold - 2)
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    selected = 0
+    
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int(np.floor((i + 1) * every)) + 1
+        next_end = min(int(np.floor((i + 2) * every)) + 1, n)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        
+        # Keep the point in this bucket that forms the largest triangle
+        start = int(np.floor(i * every)) + 1
+        end = int(np.floor((i + 1) * every)) + 1
+        area = np.abs(
+            (x[selected] - avg_x) * (y[start:end] - y[selected])
+            - (x[selected] - x[start:end]) * (avg_y - y[selected])
+        )
+        selected = start + int(np.argmax(area))
+        indices[i + 1] = selected
+    
+    return indices
+
+# Fragments rerun only their own section when a widget inside them changes;
+# stable as st.fragment since Streamlit 1.37, the pinned version
+fragment = st.fragment
+
+def _hash_payload(data):
+    """Hash an analytics dict by its JSON content rather than walking it object by object"""
+    return hash(json.dumps(data, sort_keys=True, default=str))
+
+# Figure builders are pure functions of their data, so reruns reuse the built
+# figure (as a plain dict, which st.plotly_chart accepts) instead of rebuilding it
+cached_figure = st.cache_data(ttl=3600, show_spinner=False, hash_funcs={dict: _hash_payload})
+
+# Label and monthly sections are None when the report has no such section
+IssueArrays = namedtuple('IssueArrays', [
+    'labels', 'label_counts', 'months', 'opened', 'closed',
+    'close_rate', 'response_days', 'close_days'
+])
+
+@st.cache_data(ttl=3600, show_spinner=False, hash_funcs={dict: _hash_payload})
+def issue_arrays(issue_data):
+    """Parse the issue analytics section once into the arrays every issue chart plots"""
+    labels = label_counts = months = opened = closed = None
+    
+    if 'label_distribution' in issue_data:
+        label_distribution = issue_data['label_distribution']
+        labels = np.array(list(label_distribution))
+        label_counts = np.fromiter(label_distribution.values(), dtype=np.int32, count=len(label_distribution))
+    
+    if 'issues_by_month' in issue_data:
+        monthly_data = issue_data['issues_by_month']
+        months = np.array(sorted(monthly_data))
+        opened = np.fromiter((monthly_data[month]['opened'] for month in months), dtype=np.int32, count=len(months))
+        closed = np.fromiter((monthly_data[month]['closed'] for month in months), dtype=np.int32, count=len(months))
+    
+    return IssueArrays(
+        labels, label_counts, months, opened, closed,
+        issue_data.get('close_rate'),
+        issue_data.get('avg_response_time_hours', 0) / 24,
+        issue_data.get('avg_close_time_hours', 0) / 24
+    )
+
+@cached_figure
 def create_contributor_activity_heatmap(contributor_data):
     """Create a heatmap showing contributor activity over time"""
     if not contributor_data:
         return None
     
     # Prepare data for heatmap
-    contributors = list(contributor_data.keys())[:15]  # Top 15 contributors
-    activities = ['commits', 'issues_opened', 'prs_opened', 'prs_reviewed', 'issues_commented']
+    contributors = list(islice(contributor_data, 15))  # Top 15 contributors
+    activities = ('commits', 'issues_opened', 'prs_opened', 'prs_reviewed', 'issues_commented')
     
-    z_data = []
-    y_labels = []
-    
-    for contributor in contributors:
+    # Filled in place, so Plotly gets the matrix without converting nested lists
+    z_data = np.zeros((len(contributors), len(activities)), dtype=np.int32)
+    for i, contributor in enumerate(contributors):
         stats = contributor_data[contributor]
-        row = [
-            stats.get('commits', 0),
-            stats.get('issues_opened', 0),
-            stats.get('prs_opened', 0),
-            stats.get('prs_reviewed', 0),
-            stats.get('issues_commented', 0)
-        ]
-        z_data.append(row)
-        y_labels.append(contributor[:20])  # Truncate long names
+        z_data[i] = [stats.get(activity, 0) for activity in activities]
+    y_labels = [contributor[:20] for contributor in contributors]  # Truncate long names
     
     fig = go.Figure(data=go.Heatmap(
         z=z_data,
@@ -42,24 +122,26 @@ def create_contributor_activity_heatmap(contributor_data):
         colorscale='Viridis',
         showscale=True,
         colorbar=dict(title="Activity Count")
-    ))
-    
-    fig.update_layout(
+    ), layout=go.Layout(
         title="Contributor Activity Heatmap",
         xaxis_title="Activity Type",
         yaxis_title="Contributors",
-        height=500
-    )
+        height=500,
+        **STABLE_LAYOUT
+    ))
     
-    return fig
+    return fig.to_dict()
 
+@cached_figure
 def create_issue_lifecycle_chart(issue_data):
     """Create a chart showing issue lifecycle metrics"""
     if not issue_data:
         return None
     
     # Create gauge chart for issue close rate
-    close_rate = issue_data.get('close_rate', 0)
+    close_rate = issue_arrays(issue_data).close_rate
+    if close_rate is None:
+        return None
     
     fig = go.Figure(go.Indicator(
         mode = "gauge+number+delta",
@@ -81,11 +163,11 @@ def create_issue_lifecycle_chart(issue_data):
                 'value': 90
             }
         }
-    ))
+    ), layout=go.Layout(height=400, **STABLE_LAYOUT))
     
-    fig.update_layout(height=400)
-    return fig
+    return fig.to_dict()
 
+@cached_figure
 def create_pr_size_distribution(pr_data):
     """Create a pie chart for PR size distribution"""
     if not pr_data or 'pr_size_distribution' not in pr_data:
@@ -103,17 +185,18 @@ def create_pr_size_distribution(pr_data):
         labels=labels,
         values=values,
         hole=0.3,
-        marker_colors=colors
-    )])
-    
-    fig.update_traces(textposition='inside', textinfo='percent+label')
-    fig.update_layout(
+        marker_colors=colors,
+        textposition='inside',
+        textinfo='percent+label'
+    )], layout=go.Layout(
         title="Pull Request Size Distribution",
-        annotations=[dict(text='PR Sizes', x=0.5, y=0.5, font_size=16, showarrow=False)]
-    )
+        annotations=[dict(text='PR Sizes', x=0.5, y=0.5, font_size=16, showarrow=False)],
+        **STABLE_LAYOUT
+    ))
     
-    return fig
+    return fig.to_dict()
 
+@cached_figure
 def create_commit_frequency_chart(commit_data):
     """Create a line chart showing commit frequency over time"""
     if not commit_data or 'daily_commits' not in commit_data:
@@ -123,46 +206,53 @@ def create_commit_frequency_chart(commit_data):
     if not daily_commits:
         return None
     
-    # Convert to pandas for easier manipulation
-    dates = pd.to_datetime(list(daily_commits.keys()))
-    commits = list(daily_commits.values())
-    
-    df = pd.DataFrame({'date': dates, 'commits': commits})
-    df = df.sort_values('date')
-    
-    # Create moving average
-    df['ma7'] = df['commits'].rolling(window=7, center=True).mean()
-    
-    fig = go.Figure()
-    
-    # Add daily commits
-    fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['commits'],
-        mode='markers+lines',
-        name='Daily Commits',
-        line=dict(color='lightblue', width=1),
-        marker=dict(size=4)
-    ))
-    
-    # Add moving average
-    fig.add_trace(go.Scatter(
-        x=df['date'],
-        y=df['ma7'],
-        mode='lines',
-        name='7-day Average',
-        line=dict(color='darkblue', width=3)
-    ))
-    
-    fig.update_layout(
+    dates = np.array(list(daily_commits), dtype='datetime64[D]')
+    commits = np.fromiter(daily_commits.values(), dtype=np.float64, count=len(daily_commits))
+    
+    # Daily keys usually arrive in date order already; only sort when they don't
+    if dates.size > 1 and (dates[1:] < dates[:-1]).any():
+        order = np.argsort(dates, kind='stable')
+        dates = dates[order]
+        commits = commits[order]
+    
+    # Centered 7-day moving average, undefined for the three days at each end
+    ma7 = np.full(commits.size, np.nan)
+    if commits.size >= 7:
+        ma7[3:-3] = np.convolve(commits, np.ones(7) / 7, mode='valid')
+    
+    # Thin multi-year histories, keeping peaks, after averaging over every day
+    keep = downsample_lttb(dates.astype(np.int64), commits)
+    dates, commits, ma7 = dates[keep], commits[keep], ma7[keep]
+    
+    fig = go.Figure(data=[
+        # Daily commits
+        go.Scattergl(
+            x=dates,
+            y=commits,
+            mode='markers+lines',
+            name='Daily Commits',
+            line=dict(color='lightblue', width=1),
+            marker=dict(size=4)
+        ),
+        # Moving average
+        go.Scattergl(
+            x=dates,
+            y=ma7,
+            mode='lines',
+            name='7-day Average',
+            line=dict(color='darkblue', width=3)
+        )
+    ], layout=go.Layout(
         title="Commit Frequency Over Time",
         xaxis_title="Date",
         yaxis_title="Number of Commits",
-        hovermode='x unified'
-    )
+        hovermode='x unified',
+        **STABLE_LAYOUT
+    ))
     
-    return fig
+    return fig.to_dict()
 
+@cached_figure
 def create_repository_health_radar(health_data):
     """Create a radar chart showing different aspects of repository health"""
     
@@ -179,40 +269,37 @@ def create_repository_health_radar(health_data):
     categories = list(metrics.keys())
     values = list(metrics.values())
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatterpolar(
+    fig = go.Figure(data=[go.Scatterpolar(
         r=values,
         theta=categories,
         fill='toself',
         name='Repository Health'
-    ))
-    
-    fig.update_layout(
+    )], layout=go.Layout(
         polar=dict(
             radialaxis=dict(
                 visible=True,
                 range=[0, 100]
             )),
         showlegend=True,
-        title="Repository Health Radar Chart"
-    )
+        title="Repository Health Radar Chart",
+        **STABLE_LAYOUT
+    ))
     
-    return fig
+    return fig.to_dict()
 
+@cached_figure
 def create_response_time_chart(issue_data):
     """Create a chart showing issue response times"""
     if not issue_data:
         return None
     
-    avg_response = issue_data.get('avg_response_time_hours', 0)
-    avg_close = issue_data.get('avg_close_time_hours', 0)
+    # Hours are converted to days for better readability
+    arrays = issue_arrays(issue_data)
+    if not arrays.response_days and not arrays.close_days:
+        return None
     
     categories = ['Response Time', 'Resolution Time']
-    values = [avg_response, avg_close]
-    
-    # Convert hours to days for better readability
-    values_days = [v/24 for v in values]
+    values_days = [arrays.response_days, arrays.close_days]
     
     fig = go.Figure([go.Bar(
         x=categories,
@@ -220,36 +307,36 @@ def create_response_time_chart(issue_data):
         marker_color=['#FF6B6B', '#4ECDC4'],
         text=[f'{v:.1f} days' for v in values_days],
         textposition='auto'
-    )])
-    
-    fig.update_layout(
+    )], layout=go.Layout(
         title="Average Issue Response & Resolution Times",
         yaxis_title="Time (Days)",
-        showlegend=False
-    )
+        showlegend=False,
+        **STABLE_LAYOUT
+    ))
     
-    return fig
+    return fig.to_dict()
 
 def create_language_distribution_chart(basic_stats):
     """Create a chart showing programming language distribution"""
     # This would typically come from GitHub API languages endpoint
     # For now, we'll use the primary language from basic stats
     language = basic_stats.get('language', 'Unknown')
+    if not language or language == 'Unknown':
+        return None
     
     # You can expand this to get full language statistics
-    languages = {language: 100} if language != 'Unknown' else {'Unknown': 100}
+    languages = {language: 100}
     
     fig = go.Figure([go.Bar(
         x=list(languages.keys()),
         y=list(languages.values()),
         marker_color='skyblue'
-    )])
-    
-    fig.update_layout(
+    )], layout=go.Layout(
         title="Programming Language Distribution",
         xaxis_title="Language",
-        yaxis_title="Percentage (%)"
-    )
+        yaxis_title="Percentage (%)",
+        **STABLE_LAYOUT
+    ))
     
     return fig
 
@@ -268,13 +355,13 @@ def display_advanced_metrics(data):
             # Commit frequency chart
             commit_fig = create_commit_frequency_chart(data.get('commit_activity'))
             if commit_fig:
-                st.plotly_chart(commit_fig, use_container_width=True)
+                st.plotly_chart(commit_fig, use_container_width=True, config=WEBGL_CONFIG)
         
         with col2:
             # Language distribution
             lang_fig = create_language_distribution_chart(data.get('basic_stats', {}))
             if lang_fig:
-                st.plotly_chart(lang_fig, use_container_width=True)
+                st.plotly_chart(lang_fig, use_container_width=True, config=STATIC_CONFIG)
     
     with tab2:
         # Contributor activity heatmap
@@ -285,13 +372,14 @@ def display_advanced_metrics(data):
             st.info("No contributor data available for heatmap")
     
     with tab3:
-        col1, col2 = st.columns(2)
+        # One row for all three charts, so the tab is a single layout block
+        col1, col2, col3 = st.columns([1, 1, 2])
         
         with col1:
             # Issue lifecycle
             issue_fig = create_issue_lifecycle_chart(data.get('issue_analytics'))
             if issue_fig:
-                st.plotly_chart(issue_fig, use_container_width=True)
+                st.plotly_chart(issue_fig, use_container_width=True, config=STATIC_CONFIG)
         
         with col2:
             # PR size distribution
@@ -299,10 +387,11 @@ def display_advanced_metrics(data):
             if pr_fig:
                 st.plotly_chart(pr_fig, use_container_width=True)
         
-        # Response times
-        response_fig = create_response_time_chart(data.get('issue_analytics'))
-        if response_fig:
-            st.plotly_chart(response_fig, use_container_width=True)
+        with col3:
+            # Response times
+            response_fig = create_response_time_chart(data.get('issue_analytics'))
+            if response_fig:
+                st.plotly_chart(response_fig, use_container_width=True)
     
     with tab4:
         col1, col2 = st.columns([2, 1])
@@ -311,7 +400,7 @@ def display_advanced_metrics(data):
             # Repository health radar
             radar_fig = create_repository_health_radar(data)
             if radar_fig:
-                st.plotly_chart(radar_fig, use_container_width=True)
+                st.plotly_chart(radar_fig, use_container_width=True, config=STATIC_CONFIG)
         
         with col2:
             # Health score breakdown
@@ -337,6 +426,7 @@ def display_advanced_metrics(data):
                 st.markdown("- ✅ Great job maintaining the repo!")
                 st.markdown("- 🚀 Keep up the good work!")
 
+@fragment
 def create_comparison_dashboard():
     """Create a comparison view for multiple repositories"""
     st.markdown("## ⚖️ Repository Comparison")
@@ -7,13 +7,16 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from analytics import RepositoryAnalyzer
-from config import Config
 import json
 from datetime import datetime
+from itertools import islice
 
-def demo_analytics_features():
+def demo_analytics_features(use_cache=True):
     """Demonstrate all analytics features"""
+    # The analyzer pulls in pandas, NumPy and PyGithub; only this path needs them
+    from analytics import RepositoryAnalyzer
+    from config import Config
+    import numpy as np
     
     print("🚀 Smart Repository Assistant - Analytics Demo")
     print("=" * 60)
@@ -24,12 +27,16 @@ def demo_analytics_features():
     print()
     
     try:
-        analyzer = RepositoryAnalyzer(repo_name)
+        analyzer = RepositoryAnalyzer(repo_name, use_cache=use_cache)
+        
+        # One report fetches every section concurrently, sharing the issue,
+        # PR and commit listings, instead of six serial rounds of requests
+        report = analyzer.get_comprehensive_report()
         
         # 1. Basic Repository Stats
         print("1️⃣ BASIC REPOSITORY INFORMATION")
         print("-" * 40)
-        basic_stats = analyzer.get_basic_stats()
+        basic_stats = report.get('basic_stats', {})
         
         print(f"   📂 Name: {basic_stats.get('name', 'Unknown')}")
         print(f"   📝 Description: {basic_stats.get('description', 'No description')}")
@@ -43,7 +50,7 @@ def demo_analytics_features():
         # 2. Repository Health Score
         print("2️⃣ REPOSITORY HEALTH ANALYSIS")
         print("-" * 40)
-        health_score = analyzer.calculate_health_score()
+        health_score = report.get('health_score', 0)
         
         if health_score >= 90:
             status_emoji = "🌟"
@@ -64,21 +71,21 @@ def demo_analytics_features():
         # 3. Recent Activity
         print("3️⃣ RECENT COMMIT ACTIVITY (Last 30 Days)")
         print("-" * 40)
-        commit_activity = analyzer.get_commit_activity(30)
+        commit_activity = report.get('commit_activity', {})
         
         print(f"   📈 Total Commits: {commit_activity.get('total_commits', 0)}")
         print(f"   👥 Active Contributors: {len(commit_activity.get('top_contributors', {}))}")
         
         if commit_activity.get('top_contributors'):
             print("   🏆 Top Contributors:")
-            for contributor, commits in list(commit_activity['top_contributors'].items())[:5]:
+            for contributor, commits in islice(commit_activity['top_contributors'].items(), 5):
                 print(f"      • {contributor}: {commits} commits")
         print()
         
         # 4. Issue Analytics
         print("4️⃣ ISSUE MANAGEMENT ANALYTICS")
         print("-" * 40)
-        issue_analytics = analyzer.get_issue_analytics()
+        issue_analytics = report.get('issue_analytics', {})
         
         print(f"   📊 Total Issues: {issue_analytics.get('total_issues', 0)}")
         print(f"   ✅ Closed Issues: {issue_analytics.get('closed_issues', 0)}")
@@ -90,14 +97,14 @@ def demo_analytics_features():
         
         if issue_analytics.get('label_distribution'):
             print("   🏷️ Most Used Labels:")
-            for label, count in list(issue_analytics['label_distribution'].items())[:5]:
+            for label, count in islice(issue_analytics['label_distribution'].items(), 5):
                 print(f"      • {label}: {count} issues")
         print()
         
         # 5. Pull Request Analytics
         print("5️⃣ PULL REQUEST ANALYTICS")
         print("-" * 40)
-        pr_analytics = analyzer.get_pull_request_analytics()
+        pr_analytics = report.get('pr_analytics', {})
         
         print(f"   🔀 Total PRs: {pr_analytics.get('total_prs', 0)}")
         print(f"   ✅ Merged PRs: {pr_analytics.get('merged_prs', 0)}")
@@ -113,21 +120,26 @@ def demo_analytics_features():
         # 6. Contributor Activity
         print("6️⃣ CONTRIBUTOR ENGAGEMENT (Last 90 Days)")
         print("-" * 40)
-        contributor_activity = analyzer.get_contributor_activity(90)
+        contributor_activity = report.get('contributor_activity', {})
         
         print(f"   👥 Active Contributors: {len(contributor_activity)}")
         
         if contributor_activity:
             print("   🌟 Top 5 Most Active Contributors:")
-            # Sort by total activity (commits + issues + PRs)
-            sorted_contributors = sorted(
-                contributor_activity.items(),
-                key=lambda x: x[1].get('commits', 0) + x[1].get('issues_opened', 0) + x[1].get('prs_opened', 0),
-                reverse=True
+            # Total activity (commits + issues + PRs) computed once per contributor;
+            # the stable sort keeps ties in report order, as sorted(reverse=True) did
+            logins = list(contributor_activity)
+            totals = np.fromiter(
+                (stats.get('commits', 0) + stats.get('issues_opened', 0) + stats.get('prs_opened', 0)
+                 for stats in contributor_activity.values()),
+                dtype=np.int64, count=len(logins)
             )
+            order = np.argsort(-totals, kind='stable')[:5]
             
-            for i, (contributor, stats) in enumerate(sorted_contributors[:5], 1):
-                total_activity = stats.get('commits', 0) + stats.get('issues_opened', 0) + stats.get('prs_opened', 0)
+            for i, index in enumerate(order, 1):
+                contributor = logins[index]
+                stats = contributor_activity[contributor]
+                total_activity = int(totals[index])
                 print(f"      {i}. {contributor}:")
                 print(f"         • {stats.get('commits', 0)} commits")
                 print(f"         • {stats.get('issues_opened', 0)} issues opened")
@@ -198,7 +210,8 @@ def show_available_charts():
 
 if __name__ == "__main__":
     print()
-    success = demo_analytics_features()
+    # --no-cache bypasses the local analytics snapshot and refetches everything
+    success = demo_analytics_features(use_cache='--no-cache' not in sys.argv)
     print()
     show_available_charts()
     
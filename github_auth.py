@@ -4,54 +4,147 @@ Handles authentication for both GitHub Apps and Personal Access Tokens
 """
 
 import jwt
+import functools
+import json
+import os
+import threading
 import time
-import requests
-from github import Github, Auth
+from datetime import datetime
+from cryptography.hazmat.primitives import serialization
+from PyGithub import create_github_client, get_http_session
 from config_github_app import Config
 import logging
 
 logger = logging.getLogger(__name__)
 
+# App JWTs may live at most 10 minutes; credentials are renewed this long before they expire
+APP_JWT_LIFETIME = 10 * 60
+CREDENTIAL_REFRESH_MARGIN = 60
+
+@functools.lru_cache(maxsize=1)
+def _load_private_key(path, mtime):
+    """Parse the App's PEM key once; ``mtime`` is part of the key so a rotated file is re-read"""
+    with open(path, 'rb') as key_file:
+        return serialization.load_pem_private_key(key_file.read(), password=None)
+
 class GitHubAuthManager:
+    # Shared by every manager in the process, so creating one per webhook still
+    # reuses the App JWT (10 minutes) and installation token (1 hour) until they expire
+    _credentials_lock = threading.Lock()
+    _app_jwt = None  # (jwt, expires_at)
+    _installation_token = None  # (token, expires_at)
+    _app_client = None  # (client, token it was built with)
+    
     def __init__(self):
         self.config = Config()
         self.auth_method = self.config.get_auth_method()
         self._github_client = None
+        self._auth_info = None
+        self._client_lock = threading.Lock()
         
     def get_github_client(self):
         """Get authenticated GitHub client"""
-        if self._github_client is None:
-            if self.auth_method == 'github_app':
-                self._github_client = self._get_app_client()
-            elif self.auth_method == 'personal_token':
-                self._github_client = self._get_token_client()
-            else:
-                raise Exception("No GitHub authentication configured")
+        if self.auth_method == 'github_app':
+            # Not memoized per instance: the client changes when the token is renewed
+            return self._get_app_client()
+        
+        # Concurrent first calls build the client once
+        with self._client_lock:
+            if self._github_client is None:
+                if self.auth_method == 'personal_token':
+                    self._github_client = self._get_token_client()
+                else:
+                    raise Exception("No GitHub authentication configured")
         
         return self._github_client
     
+    def get_github_token(self):
+        """Token the client authenticates with, for APIs PyGithub doesn't cover (GraphQL)"""
+        if self.auth_method == 'github_app':
+            with self._credentials_lock:
+                return self._current_installation_token()
+        if self.auth_method == 'personal_token':
+            return self.config.GITHUB_TOKEN
+        raise Exception("No GitHub authentication configured")
+    
     def _get_app_client(self):
         """Get GitHub client using GitHub App authentication"""
         try:
-            # Generate JWT for the GitHub App
-            app_jwt = self._generate_app_jwt()
-            
-            # Get installation access token
-            installation_token = self._get_installation_token(app_jwt)
-            
-            # Create authenticated GitHub client
-            auth = Auth.Token(installation_token)
-            return Github(auth=auth)
+            with self._credentials_lock:
+                installation_token = self._current_installation_token()
+                
+                # Create authenticated GitHub client; GETs revalidate with ETags
+                cached = GitHubAuthManager._app_client
+                if cached is None or cached[1] != installation_token:
+                    client = create_github_client(
+                        installation_token,
+                        cache_key=('app', self.config.GITHUB_APP_ID, self.config.GITHUB_APP_INSTALLATION_ID)
+                    )
+                    GitHubAuthManager._app_client = (client, installation_token)
+                return GitHubAuthManager._app_client[0]
             
         except Exception as e:
             logger.error(f"Failed to authenticate with GitHub App: {e}")
             raise
     
+    def _current_installation_token(self):
+        """Installation token still valid for at least the refresh margin, renewed otherwise"""
+        cached = GitHubAuthManager._installation_token or self._load_installation_token()
+        if cached and cached[1] - CREDENTIAL_REFRESH_MARGIN > time.time():
+            GitHubAuthManager._installation_token = cached
+            return cached[0]
+        
+        # Generate JWT for the GitHub App, then get an installation access token with it
+        token, expires_at = self._get_installation_token(self._current_app_jwt())
+        GitHubAuthManager._installation_token = (token, expires_at)
+        self._save_installation_token(token, expires_at)
+        return token
+    
+    def _current_app_jwt(self):
+        """App JWT still valid for at least the refresh margin, re-signed otherwise"""
+        cached = GitHubAuthManager._app_jwt
+        if cached is None or cached[1] - CREDENTIAL_REFRESH_MARGIN <= time.time():
+            GitHubAuthManager._app_jwt = (self._generate_app_jwt(), time.time() + APP_JWT_LIFETIME)
+        return GitHubAuthManager._app_jwt[0]
+    
+    def _load_installation_token(self):
+        """Token persisted by an earlier process for this App installation, if any"""
+        path = self.config.GITHUB_APP_TOKEN_CACHE_PATH
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as cache_file:
+                cached = json.load(cache_file)
+            if (cached.get('app_id'), cached.get('installation_id')) != (
+                    self.config.GITHUB_APP_ID, self.config.GITHUB_APP_INSTALLATION_ID):
+                return None
+            return cached['token'], cached['expires_at']
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable installation token cache: {e}")
+            return None
+    
+    def _save_installation_token(self, token, expires_at):
+        """Persist the token, readable by the owner only, so restarts skip the exchange"""
+        path = self.config.GITHUB_APP_TOKEN_CACHE_PATH
+        if not path:
+            return
+        try:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as cache_file:
+                json.dump({
+                    'app_id': self.config.GITHUB_APP_ID,
+                    'installation_id': self.config.GITHUB_APP_INSTALLATION_ID,
+                    'token': token,
+                    'expires_at': expires_at
+                }, cache_file)
+        except OSError as e:
+            logger.warning(f"Could not persist installation token: {e}")
+    
     def _get_token_client(self):
         """Get GitHub client using Personal Access Token"""
         try:
-            auth = Auth.Token(self.config.GITHUB_TOKEN)
-            return Github(auth=auth)
+            return create_github_client(self.config.GITHUB_TOKEN)
         except Exception as e:
             logger.error(f"Failed to authenticate with Personal Token: {e}")
             raise
@@ -59,15 +152,15 @@ class GitHubAuthManager:
     def _generate_app_jwt(self):
         """Generate JWT for GitHub App authentication"""
         try:
-            # Read private key
-            with open(self.config.GITHUB_APP_PRIVATE_KEY_PATH, 'r') as key_file:
-                private_key = key_file.read()
+            # Parsed key object, so PyJWT signs without re-decoding the PEM each time
+            key_path = self.config.GITHUB_APP_PRIVATE_KEY_PATH
+            private_key = _load_private_key(key_path, os.path.getmtime(key_path))
             
             # Create JWT payload
             now = int(time.time())
             payload = {
                 'iat': now - 60,  # Issued 60 seconds ago
-                'exp': now + (10 * 60),  # Expires in 10 minutes
+                'exp': now + APP_JWT_LIFETIME,  # Expires in 10 minutes
                 'iss': self.config.GITHUB_APP_ID  # GitHub App ID
             }
             
@@ -80,7 +173,7 @@ class GitHubAuthManager:
             raise
     
     def _get_installation_token(self, app_jwt):
-        """Get installation access token using the App JWT"""
+        """Get an installation access token and its expiry (epoch seconds) using the App JWT"""
         try:
             headers = {
                 'Authorization': f'Bearer {app_jwt}',
@@ -89,10 +182,18 @@ class GitHubAuthManager:
             
             url = f'https://api.github.com/app/installations/{self.config.GITHUB_APP_INSTALLATION_ID}/access_tokens'
             
-            response = requests.post(url, headers=headers)
+            # Shared pool, so token exchanges under concurrent webhooks reuse warm TLS connections
+            response = get_http_session().post(url, headers=headers)
             response.raise_for_status()
             
-            return response.json()['token']
+            data = response.json()
+            # expires_at is ISO-8601 UTC ("2024-01-01T12:00:00Z"); tokens last an hour
+            expires_at = data.get('expires_at')
+            if expires_at:
+                expires_at = datetime.fromisoformat(expires_at.replace('Z', '+00:00')).timestamp()
+            else:
+                expires_at = time.time() + 3600
+            return data['token'], expires_at
             
         except Exception as e:
             logger.error(f"Failed to get installation token: {e}")
@@ -100,12 +201,16 @@ class GitHubAuthManager:
     
     def get_auth_info(self):
         """Get information about current authentication"""
-        return {
-            'method': self.auth_method,
-            'app_configured': self.config.is_github_app_configured(),
-            'token_configured': bool(self.config.GITHUB_TOKEN),
-            'webhook_configured': bool(self.config.GITHUB_WEBHOOK_SECRET)
-        }
+        # Settings are read once at import and the method is fixed at construction,
+        # so the key-file check runs once; callers get their own copy
+        if self._auth_info is None:
+            self._auth_info = {
+                'method': self.auth_method,
+                'app_configured': self.config.is_github_app_configured(),
+                'token_configured': bool(self.config.GITHUB_TOKEN),
+                'webhook_configured': bool(self.config.GITHUB_WEBHOOK_SECRET)
+            }
+        return dict(self._auth_info)
 
 # Global auth manager instance
 auth_manager = GitHubAuthManager()
@@ -114,6 +219,10 @@ def get_github_client():
     """Convenience function to get authenticated GitHub client"""
     return auth_manager.get_github_client()
 
+def get_github_token():
+    """Convenience function to get the current GitHub token"""
+    return auth_manager.get_github_token()
+
 def get_auth_info():
     """Get authentication information"""
     return auth_manager.get_auth_info()
\ No newline at end of file
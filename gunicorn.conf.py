@@ -0,0 +1,21 @@
+"""
+Gunicorn settings for the Smart Repository Assistant webhook server
+Loaded automatically by ``gunicorn app:app`` when run from the project root
+"""
+import os
+from config import Config
+
+bind = f"{Config.FLASK_HOST}:{os.getenv('PORT', Config.FLASK_PORT)}"
+
+# One threaded worker by default: webhook delivery dedup, debounce and the
+# analytics cache live in process memory, so extra workers would each keep
+# their own copy. Threads overlap the GitHub API waits of concurrent requests.
+worker_class = "gthread"
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 32))
+
+# Keep connections open so repeat webhook deliveries reuse TCP/TLS sessions
+keepalive = 15
+timeout = 120
+
+accesslog = "-"
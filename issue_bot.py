@@ -3,43 +3,87 @@ Smart Repository Assistant - Issue Bot
 Intelligent issue classification and auto-labeling system
 """
 
+import hashlib
 import re
+import sqlite3
+import threading
+import requests
 from datetime import datetime
-from github import Github
-from textblob import TextBlob
+from github import GithubException
+from github.Issue import Issue
+from github.PullRequest import PullRequest
+from github.Repository import Repository
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from PyGithub import GitHubGraphQL, create_github_client
+from cache_store import get_classification_store
 from config import Config
 
+# Look for common patterns like file paths, modules, etc.; compiled once at import
+_COMPONENT_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'`([^`]+\.(?:py|js|html))`',  # Python, JavaScript and HTML files in backticks
+    r'in (\w+) module',  # Module mentions
+    r'(\w+) component',  # Component mentions
+))
+
+# Top-level mutation fields run in order, so clearing then adding replaces the
+# labels like set_labels does, and the comment lands in the same round-trip
+_LABEL_AND_COMMENT_MUTATION = """
+mutation($id: ID!, $labelIds: [ID!]!, $body: String!) {
+  clearLabelsFromLabelable(input: {labelableId: $id}) { clientMutationId }
+  addLabelsToLabelable(input: {labelableId: $id, labelIds: $labelIds}) { clientMutationId }
+  addComment(input: {subjectId: $id, body: $body}) { clientMutationId }
+}
+"""
+
+# Label names with their node ids, which the batched mutation needs
+_LABELS_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    labels(first: 100, after: $cursor) {
+      pageInfo { hasNextPage endCursor }
+      nodes { id name }
+    }
+  }
+}
+"""
+
+# VADER scores from a precompiled lexicon without POS tagging; loaded once per process
+_VADER = SentimentIntensityAnalyzer()
+
 class IssueClassifier:
     def __init__(self):
         self.config = Config()
         
-    def classify_issue_type(self, title, body):
+    def classify_issue_type(self, title, body, text_lower=None):
         """Classify issue type based on title and body content"""
-        text = f"{title} {body}".lower()
-        
-        scores = {}
-        for label, keywords in self.config.ISSUE_LABELS.items():
-            score = sum(1 for keyword in keywords if keyword in text)
-            if score > 0:
-                scores[label] = score
+        # ``text_lower`` is the lowercased "title body" when the caller already has it
+        if text_lower is None:
+            text_lower = f"{title} {body}".lower()
+        scores = self.config.ISSUE_LABEL_MATCHER.scores_lowered(text_lower)
         
         # Return the label with highest score, or 'general' if no matches
         return max(scores, key=scores.get) if scores else 'general'
     
-    def determine_priority(self, title, body):
+    def classify_batch(self, pairs):
+        """Issue type for each (title, body) pair, e.g. a burst of webhook events"""
+        # The keyword regex is compiled once at import, so each pair is a single scan
+        return [self.classify_issue_type(title, body) for title, body in pairs]
+    
+    def determine_priority(self, title, body, text_lower=None):
         """Determine priority based on content analysis"""
-        text = f"{title} {body}".lower()
+        if text_lower is None:
+            text_lower = f"{title} {body}".lower()
+        matched = self.config.PRIORITY_MATCHER.scores_lowered(text_lower)
         
-        for priority, keywords in self.config.PRIORITY_KEYWORDS.items():
-            if any(keyword in text for keyword in keywords):
+        for priority in self.config.PRIORITY_KEYWORDS:
+            if priority in matched:
                 return priority
         
         return 'medium'  # default priority
     
     def analyze_sentiment(self, text):
         """Analyze sentiment of the issue text"""
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
+        polarity = _VADER.polarity_scores(text)['compound']
         
         if polarity < -0.3:
             return 'negative'
@@ -52,26 +96,37 @@ class IssueClassifier:
         """Extract mentioned components/modules from issue body"""
         components = []
         
-        # Look for common patterns like file paths, modules, etc.
-        patterns = [
-            r'`([^`]+\.py)`',  # Python files in backticks
-            r'`([^`]+\.js)`',  # JavaScript files
-            r'`([^`]+\.html)`',  # HTML files
-            r'in (\w+) module',  # Module mentions
-            r'(\w+) component',  # Component mentions
-        ]
-        
-        for pattern in patterns:
-            matches = re.findall(pattern, body, re.IGNORECASE)
-            components.extend(matches)
+        for pattern in _COMPONENT_PATTERNS:
+            components.extend(pattern.findall(body))
         
         return list(set(components))  # Remove duplicates
 
 class SmartIssueBot:
     def __init__(self, github_token=None):
         self.github_token = github_token or Config.GITHUB_TOKEN
-        self.github = Github(self.github_token)
+        # Conditional requests: unchanged repos/labels come back 304 at no rate-limit cost
+        self.github = create_github_client(self.github_token)
+        # GraphQL needs an authenticated token; anonymous use stays on REST
+        self.graphql = GitHubGraphQL(self.github_token) if self.github_token else None
         self.classifier = IssueClassifier()
+        # Node IDs of labels known to exist, keyed by (repo full name, lowercased
+        # label), and the repos whose labels were listed, so each label costs no
+        # request after the first
+        self._label_cache = {}
+        self._labels_loaded = set()
+        self._label_lock = threading.Lock()
+        # Earlier classifications, so edits that leave title and body unchanged
+        # (or re-deliveries) are not analyzed again
+        self.classification_store = None
+        if Config.CLASSIFIER_CACHE_ENABLED:
+            try:
+                self.classification_store = get_classification_store(Config.CLASSIFIER_CACHE_PATH)
+            except sqlite3.Error as e:
+                print(f"Classification cache unavailable: {e}")
+        # Keys the digests with the keyword tables, so changing them invalidates old results
+        self._classification_salt = hashlib.blake2b(
+            repr((Config.ISSUE_LABELS, Config.PRIORITY_KEYWORDS)).encode(), digest_size=16
+        ).digest()
         
     def process_issue(self, webhook_data):
         """Process incoming webhook data for issues"""
@@ -82,17 +137,17 @@ class SmartIssueBot:
             if action not in ['opened', 'edited']:
                 return
             
-            repo_name = webhook_data['repository']['full_name']
-            issue_number = issue_data['number']
-            title = issue_data['title']
-            body = issue_data['body'] or ''
-            
-            # Get repository and issue objects
-            repo = self.github.get_repo(repo_name)
-            issue = repo.get_issue(issue_number)
+            # Get repository and issue objects, from the payload when it carries them
+            repo = self._payload_repo(webhook_data['repository'])
+            if 'url' in issue_data and 'node_id' in issue_data:
+                issue = self.github.create_from_raw_data(Issue, issue_data)
+            else:
+                issue = repo.get_issue(issue_data['number'])
+            title = issue.title
+            body = issue.body or ''
             
             # Classify and process the issue
-            self._classify_and_label_issue(issue, title, body)
+            self._classify_and_label_issue(repo, issue, title, body)
             
         except Exception as e:
             print(f"Error processing issue: {e}")
@@ -106,35 +161,70 @@ class SmartIssueBot:
             if action not in ['opened', 'edited']:
                 return
             
-            repo_name = webhook_data['repository']['full_name']
-            pr_number = pr_data['number']
-            title = pr_data['title']
-            body = pr_data['body'] or ''
-            
-            # Get repository and PR objects
-            repo = self.github.get_repo(repo_name)
-            pr = repo.get_pull(pr_number)
+            # Get repository and PR objects, from the payload when it carries them
+            repo = self._payload_repo(webhook_data['repository'])
+            if 'url' in pr_data and 'additions' in pr_data:
+                pr = self.github.create_from_raw_data(PullRequest, pr_data)
+            else:
+                pr = repo.get_pull(pr_data['number'])
+            title = pr.title
+            body = pr.body or ''
             
             # Classify and process the PR
-            self._classify_and_label_pr(pr, title, body)
+            self._classify_and_label_pr(repo, pr, title, body)
             
         except Exception as e:
             print(f"Error processing PR: {e}")
     
-    def _classify_and_label_issue(self, issue, title, body):
-        """Classify issue and apply appropriate labels"""
+    def _payload_repo(self, repository_data):
+        """Repository built from the webhook payload, fetched only when the payload lacks it"""
+        if 'url' in repository_data:
+            return self.github.create_from_raw_data(Repository, repository_data)
+        return self.github.get_repo(repository_data['full_name'])
+    
+    def _classify(self, title, body):
+        """Type, priority, sentiment and components of an issue"""
+        # Built and lowercased once for both keyword scans
+        text = f"{title} {body}"
+        text_lower = text.lower()
+        
         # Classify issue type
-        issue_type = self.classifier.classify_issue_type(title, body)
+        issue_type = self.classifier.classify_issue_type(title, body, text_lower)
         
         # Determine priority
-        priority = self.classifier.determine_priority(title, body)
+        priority = self.classifier.determine_priority(title, body, text_lower)
         
-        # Analyze sentiment
-        sentiment = self.classifier.analyze_sentiment(f"{title} {body}")
+        # Analyze sentiment; VADER reads capitalization as emphasis, so it gets the original case
+        sentiment = self.classifier.analyze_sentiment(text)
         
         # Extract components
         components = self.classifier.extract_components(body)
         
+        return issue_type, priority, sentiment, components
+    
+    def _cached_classify(self, title, body):
+        """Classification from the store when this title and body were seen before"""
+        if self.classification_store is None:
+            return self._classify(title, body)
+        
+        digest = hashlib.blake2b(
+            f"{title}\x00{body}".encode(), digest_size=16, key=self._classification_salt
+        ).digest()
+        try:
+            cached = self.classification_store.get(digest)
+            if cached is not None:
+                return cached
+            result = self._classify(title, body)
+            self.classification_store.put(digest, *result)
+            return result
+        except sqlite3.Error as e:
+            print(f"Classification cache error: {e}")
+            return self._classify(title, body)
+    
+    def _classify_and_label_issue(self, repo, issue, title, body):
+        """Classify issue and apply appropriate labels"""
+        issue_type, priority, sentiment, components = self._cached_classify(title, body)
+        
         # Apply labels
         labels_to_add = [issue_type]
         
@@ -151,18 +241,16 @@ class SmartIssueBot:
         # Apply labels to the issue
         try:
             for label in labels_to_add:
-                self._create_label_if_not_exists(issue.repository, label)
-            
-            issue.set_labels(*labels_to_add)
+                self._create_label_if_not_exists(repo, label)
             
             # Add a comment explaining the auto-labeling
             comment = self._generate_auto_label_comment(issue_type, priority, components)
-            issue.create_comment(comment)
+            self._set_labels_and_comment(repo, issue, labels_to_add, comment)
             
         except Exception as e:
             print(f"Error applying labels: {e}")
     
-    def _classify_and_label_pr(self, pr, title, body):
+    def _classify_and_label_pr(self, repo, pr, title, body):
         """Classify PR and apply appropriate labels"""
         # Similar logic for PRs
         pr_type = self._classify_pr_type(title, body)
@@ -177,7 +265,7 @@ class SmartIssueBot:
         # Apply labels
         try:
             for label in labels_to_add:
-                self._create_label_if_not_exists(pr.base.repo, label)
+                self._create_label_if_not_exists(repo, label)
             
             pr.set_labels(*labels_to_add)
             
@@ -186,20 +274,13 @@ class SmartIssueBot:
     
     def _classify_pr_type(self, title, body):
         """Classify PR type based on title and content"""
-        text = f"{title} {body}".lower()
-        
-        if any(word in text for word in ['fix', 'bug', 'error', 'issue']):
-            return 'bugfix'
-        elif any(word in text for word in ['feat', 'feature', 'add', 'new']):
-            return 'feature'
-        elif any(word in text for word in ['doc', 'documentation', 'readme']):
-            return 'documentation'
-        elif any(word in text for word in ['refactor', 'cleanup', 'improve']):
-            return 'refactor'
-        elif any(word in text for word in ['test', 'testing']):
-            return 'test'
-        else:
-            return 'enhancement'
+        matched = Config.PR_TYPE_MATCHER.scores(f"{title} {body}")
+        
+        for pr_type in Config.PR_TYPE_KEYWORDS:
+            if pr_type in matched:
+                return pr_type
+        
+        return 'enhancement'
     
     def _determine_pr_size(self, pr):
         """Determine PR size based on changes"""
@@ -216,51 +297,103 @@ class SmartIssueBot:
         else:
             return 'size:xl'
     
+    def _load_labels(self, repo):
+        """List a repository's labels once, instead of probing each with get_label"""
+        with self._label_lock:
+            if repo.full_name in self._labels_loaded:
+                return
+            try:
+                if self.graphql:
+                    # Listed REST labels are lazy and ``raw_data`` would re-fetch each one
+                    # for its node id; the GraphQL listing returns ids inline
+                    owner, _, name = repo.full_name.partition('/')
+                    labels = [(label['name'], label['id']) for label in self.graphql.paginate(
+                        _LABELS_QUERY, {'owner': owner, 'name': name}, ('repository', 'labels')
+                    )]
+                else:
+                    # Node ids only matter for the GraphQL mutation
+                    labels = [(label.name, None) for label in repo.get_labels()]
+                self._label_cache.update(
+                    ((repo.full_name, label_name.lower()), node_id) for label_name, node_id in labels
+                )
+                self._labels_loaded.add(repo.full_name)
+            except (GithubException, requests.RequestException) as e:
+                print(f"Error listing labels: {e}")
+    
     def _create_label_if_not_exists(self, repo, label_name):
         """Create a label if it doesn't exist"""
+        # GitHub label names are case-insensitive
+        key = (repo.full_name, label_name.lower())
+        self._load_labels(repo)
+        if key in self._label_cache:
+            return
+        
+        # Without a listing to trust, probe this one label as before
+        if repo.full_name not in self._labels_loaded:
+            try:
+                self._label_cache[key] = repo.get_label(label_name).raw_data.get('node_id')
+                return
+            except GithubException as e:
+                if e.status != 404:
+                    print(f"Error checking label {label_name}: {e}")
+                    return
+        
+        # Label doesn't exist, create it
+        color = Config.LABEL_COLORS.get(label_name, Config.DEFAULT_LABEL_COLOR)
+        
         try:
-            repo.get_label(label_name)
-        except:
-            # Label doesn't exist, create it
-            color_map = {
-                'bug': 'd73a4a',
-                'feature': '0075ca',
-                'documentation': '0052cc',
-                'question': 'd876e3',
-                'enhancement': 'a2eeef',
-                'priority:critical': 'b60205',
-                'priority:high': 'd93f0b',
-                'priority:medium': 'fbca04',
-                'priority:low': '0e8a16',
-                'needs-attention': 'ff6b6b',
-                'size:small': 'c2e0c6',
-                'size:medium': 'f9d71c',
-                'size:large': 'dfa878',
-                'size:xl': 'd73a4a'
-            }
-            
-            color = color_map.get(label_name.split(':')[0], '7057ff')
-            if ':' in label_name:
-                color = color_map.get(label_name, '7057ff')
-            
+            self._label_cache[key] = repo.create_label(label_name, color).raw_data.get('node_id')
+        except GithubException as e:
+            if e.status != 422:
+                # Left uncached, so the next event tries again
+                print(f"Error creating label {label_name}: {e}")
+                return
+            # Created concurrently; fetch it for its node id
             try:
-                repo.create_label(label_name, color)
-            except:
-                pass  # Label might have been created concurrently
+                self._label_cache[key] = repo.get_label(label_name).raw_data.get('node_id')
+            except GithubException as e:
+                print(f"Error fetching label {label_name}: {e}")
+    
+    def _set_labels_and_comment(self, repo, issue, labels, comment):
+        """Replace the issue's labels and post the comment, in one GraphQL round-trip when possible"""
+        labels_done = comment_done = False
+        label_ids = [self._label_cache.get((repo.full_name, label.lower())) for label in labels]
+        
+        if self.graphql and all(label_ids):
+            try:
+                data = self.graphql.execute(_LABEL_AND_COMMENT_MUTATION, {
+                    'id': issue.raw_data['node_id'],
+                    'labelIds': label_ids,
+                    'body': comment
+                }, allow_partial=True)
+                # Failed fields come back null next to the errors
+                labels_done = (data.get('clearLabelsFromLabelable') is not None
+                               and data.get('addLabelsToLabelable') is not None)
+                comment_done = data.get('addComment') is not None
+            except (GithubException, requests.RequestException, KeyError) as e:
+                print(f"Batched labeling failed, falling back to REST: {e}")
+        
+        # Only what the mutation didn't do is repeated, so the comment is never posted twice
+        if not labels_done:
+            issue.set_labels(*labels)
+        if not comment_done:
+            issue.create_comment(comment)
     
     def _generate_auto_label_comment(self, issue_type, priority, components):
         """Generate a helpful comment explaining the auto-labeling"""
-        comment = f"🤖 **Auto-labeling complete!**\n\n"
-        comment += f"- **Type**: {issue_type}\n"
-        comment += f"- **Priority**: {priority}\n"
+        parts = [
+            "🤖 **Auto-labeling complete!**\n\n",
+            f"- **Type**: {issue_type}\n",
+            f"- **Priority**: {priority}\n"
+        ]
         
         if components:
-            comment += f"- **Components**: {', '.join(components)}\n"
+            parts.append(f"- **Components**: {', '.join(components)}\n")
         
-        comment += f"\n*This issue was automatically analyzed and labeled. "
-        comment += f"If you think the labels are incorrect, please feel free to modify them.*"
+        parts.append("\n*This issue was automatically analyzed and labeled. "
+                     "If you think the labels are incorrect, please feel free to modify them.*")
         
-        return comment
+        return "".join(parts)
 
 # Legacy function for backward compatibility
 def process_issue(webhook_data):
@@ -5,73 +5,12 @@ Initialize and configure the system
 
 import os
 import sys
+import shutil
 from pathlib import Path
 import subprocess
 
-def create_env_file():
-    """Create .env file from template if it doesn't exist"""
-    env_file = Path(".env")
-    env_example = Path(".env.example")
-    
-    if not env_file.exists() and env_example.exists():
-        print("📝 Creating .env file from template...")
-        with open(env_example, 'r') as src, open(env_file, 'w') as dst:
-            content = src.read()
-            dst.write(content)
-        print("   ✅ .env file created. Please edit it with your settings.")
-        return True
-    elif env_file.exists():
-        print("   ℹ️ .env file already exists")
-        return True
-    else:
-        print("   ⚠️ .env.example not found")
-        return False
-
-def install_dependencies():
-    """Install Python dependencies"""
-    print("📦 Installing dependencies...")
-    try:
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "-r", "requirements.txt"])
-        print("   ✅ Dependencies installed successfully")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"   ❌ Error installing dependencies: {e}")
-        return False
-
-def create_directories():
-    """Create necessary directories"""
-    directories = [
-        "logs",
-        "reports",
-        "templates"
-    ]
-    
-    print("📁 Creating directories...")
-    for dir_name in directories:
-        dir_path = Path(dir_name)
-        if not dir_path.exists():
-            dir_path.mkdir()
-            print(f"   ✅ Created {dir_name}/ directory")
-        else:
-            print(f"   ℹ️ {dir_name}/ directory already exists")
-    
-    return True
-
-def setup_github_templates():
-    """Set up GitHub issue and PR templates"""
-    github_dir = Path(".github")
-    template_dir = github_dir / "ISSUE_TEMPLATE"
-    
-    print("📋 Setting up GitHub templates...")
-    
-    # Create directories
-    template_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Bug report template
-    bug_template = template_dir / "bug_report.md"
-    if not bug_template.exists():
-        with open(bug_template, 'w') as f:
-            f.write("""---
+# Written by setup_github_templates when missing, relative to .github/
+_BUG_REPORT_TEMPLATE = """---
 name: Bug report
 about: Create a report to help us improve
 title: '[BUG] '
@@ -101,14 +40,9 @@ If applicable, add screenshots to help explain your problem.
 
 ## Additional Context
 Add any other context about the problem here.
-""")
-        print("   ✅ Created bug report template")
-    
-    # Feature request template
-    feature_template = template_dir / "feature_request.md"
-    if not feature_template.exists():
-        with open(feature_template, 'w') as f:
-            f.write("""---
+"""
+
+_FEATURE_REQUEST_TEMPLATE = """---
 name: Feature request
 about: Suggest an idea for this project
 title: '[FEATURE] '
@@ -130,14 +64,9 @@ A clear and concise description of any alternative solutions or features you've
 
 ## Additional Context
 Add any other context or screenshots about the feature request here.
-""")
-        print("   ✅ Created feature request template")
-    
-    # Pull request template
-    pr_template = github_dir / "pull_request_template.md"
-    if not pr_template.exists():
-        with open(pr_template, 'w') as f:
-            f.write("""## Description
+"""
+
+_PR_TEMPLATE = """## Description
 Brief description of the changes in this pull request.
 
 ## Type of Change
@@ -166,8 +95,83 @@ Closes #(issue number)
 
 ## Screenshots (if applicable)
 Add screenshots to help explain your changes.
-""")
-        print("   ✅ Created pull request template")
+"""
+
+_GITHUB_TEMPLATES = (
+    ("ISSUE_TEMPLATE/bug_report.md", _BUG_REPORT_TEMPLATE, "bug report template"),
+    ("ISSUE_TEMPLATE/feature_request.md", _FEATURE_REQUEST_TEMPLATE, "feature request template"),
+    ("pull_request_template.md", _PR_TEMPLATE, "pull request template")
+)
+
+def create_env_file():
+    """Create .env file from template if it doesn't exist"""
+    env_file = Path(".env")
+    env_example = Path(".env.example")
+    
+    if not env_file.exists() and env_example.exists():
+        print("📝 Creating .env file from template...")
+        # Copied by the OS without reading the file into Python
+        shutil.copyfile(env_example, env_file)
+        print("   ✅ .env file created. Please edit it with your settings.")
+        return True
+    elif env_file.exists():
+        print("   ℹ️ .env file already exists")
+        return True
+    else:
+        print("   ⚠️ .env.example not found")
+        return False
+
+def install_dependencies():
+    """Install Python dependencies"""
+    print("📦 Installing dependencies...")
+    # uv resolves and downloads in parallel from a shared cache; target this interpreter
+    # either way, and prefer wheels over building sdists from source
+    if shutil.which("uv"):
+        command = ["uv", "pip", "install", "--python", sys.executable, "-r", "requirements.txt"]
+    else:
+        command = [sys.executable, "-m", "pip", "install", "--prefer-binary", "-r", "requirements.txt"]
+    try:
+        subprocess.check_call(command)
+        print("   ✅ Dependencies installed successfully")
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"   ❌ Error installing dependencies: {e}")
+        return False
+
+def create_directories():
+    """Create necessary directories"""
+    directories = [
+        "logs",
+        "reports",
+        "templates"
+    ]
+    
+    print("📁 Creating directories...")
+    for dir_name in directories:
+        dir_path = Path(dir_name)
+        if not dir_path.exists():
+            dir_path.mkdir()
+            print(f"   ✅ Created {dir_name}/ directory")
+        else:
+            print(f"   ℹ️ {dir_name}/ directory already exists")
+    
+    return True
+
+def setup_github_templates():
+    """Set up GitHub issue and PR templates"""
+    github_dir = Path(".github")
+    template_dir = github_dir / "ISSUE_TEMPLATE"
+    
+    print("📋 Setting up GitHub templates...")
+    
+    # Create directories
+    template_dir.mkdir(parents=True, exist_ok=True)
+    
+    for relative_path, content, description in _GITHUB_TEMPLATES:
+        template = github_dir / relative_path
+        if not template.exists():
+            template.write_text(content)
+            print(f"   ✅ Created {description}")
     
     return True
 
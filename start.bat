@@ -31,6 +31,9 @@ if errorlevel 1 (
     exit /b 1
 )
 
+:: gunicorn does not run on Windows, so use the Flask development server
+set FLASK_DEV=1
+
 :: Install dependencies
 echo Installing dependencies...
 pip install -r requirements.txt
@@ -70,7 +70,7 @@ read -p "Enter your choice (1-4): " choice
 case $choice in
     1)
         echo "Starting webhook server..."
-        python app.py
+        gunicorn app:app
         ;;
     2)
         echo "Starting analytics dashboard..."
@@ -78,7 +78,7 @@ case $choice in
         ;;
     3)
         echo "Starting both services..."
-        python app.py &
+        gunicorn app:app &
         FLASK_PID=$!
         echo "Flask server started with PID: $FLASK_PID"
         
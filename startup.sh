@@ -20,4 +20,4 @@ fi
 # Start the Flask application
 echo "🌟 Starting Flask webhook server..."
 cd /home/site/wwwroot
-python app.py
\ No newline at end of file
+gunicorn app:app
\ No newline at end of file